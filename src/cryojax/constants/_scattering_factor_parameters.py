@@ -3,6 +3,7 @@ Routines for loading atomic structures.
 Large amounts of the code are adapted from the ioSPI package
 """
 
+import functools
 import importlib.resources as pkg_resources
 import os
 from typing import Optional
@@ -40,9 +41,14 @@ def get_tabulated_scattering_factor_parameters(
     """
     if scattering_factor_parameter_table is None:
         scattering_factor_parameter_table = (
-            read_peng_element_scattering_factor_parameter_table()
+            _load_peng_element_scattering_factor_parameter_table()
         )
-    return jnp.asarray(scattering_factor_parameter_table)[:, jnp.asarray(atom_identities)]
+    # Gather the parameters for all atoms at once
+    return jnp.take(
+        jnp.asarray(scattering_factor_parameter_table),
+        jnp.asarray(atom_identities),
+        axis=1,
+    )
 
 
 def read_peng_element_scattering_factor_parameter_table() -> (
@@ -57,11 +63,21 @@ def read_peng_element_scattering_factor_parameter_table() -> (
     The parameter table for parameters $\{a_i\}_{i = 1}^5$ and $\{b_i\}_{i = 1}^5$
     for each atom, described in the above reference.
     """
+    return np.array(_load_peng_element_scattering_factor_parameter_table())
+
+
+@functools.cache
+def _load_peng_element_scattering_factor_parameter_table() -> (
+    Float[np.ndarray, "2 n_elements 5"]
+):
+    # The table is read from disk once, and then it is shared. It is
+    # made read-only so that it cannot be modified in place
     with pkg_resources.as_file(
         pkg_resources.files("cryojax").joinpath("constants")
     ) as path:
-        atom_scattering_factor_params = jnp.load(
+        atom_scattering_factor_params = np.load(
             os.path.join(path, "peng1996_element_params.npy")
         )
+    atom_scattering_factor_params.flags.writeable = False
 
-    return np.asarray(atom_scattering_factor_params)
+    return atom_scattering_factor_params
@@ -14,6 +14,7 @@ from ._edges import (
     resize_with_crop_or_pad as resize_with_crop_or_pad,
 )
 from ._fft import (
+    compute_fast_fft_length as compute_fast_fft_length,
     fftn as fftn,
     ifftn as ifftn,
     irfftn as irfftn,
@@ -28,6 +29,7 @@ from ._normalize import normalize_image as normalize_image, rescale_image as res
 from ._rescale_pixel_size import (
     maybe_rescale_pixel_size as maybe_rescale_pixel_size,
     rescale_pixel_size as rescale_pixel_size,
+    rescale_pixel_size_in_fourier_space as rescale_pixel_size_in_fourier_space,
 )
 from ._spectrum import (
     compute_radially_averaged_powerspectrum as compute_radially_averaged_powerspectrum,
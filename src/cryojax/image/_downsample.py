@@ -3,10 +3,10 @@
 from typing import overload
 
 import jax.numpy as jnp
-from jaxtyping import Array, Inexact
+from jaxtyping import Array, Complex, Float, Inexact
 
 from ._edges import crop_to_shape
-from ._fft import fftn, ifftn
+from ._fft import fftn, ifftn, rfftn
 
 
 @overload
@@ -122,6 +122,11 @@ def downsample_to_shape_with_fourier_cropping(
     the downsampled array in fourier space assuming hermitian symmetry,
     with the zero frequency component in the corner.
     """
+    if not get_real and jnp.issubdtype(image_or_volume.dtype, jnp.floating):
+        # ... a real array only needs the half of its spectrum that is returned
+        return _downsample_to_rfft_with_fourier_cropping(
+            image_or_volume, downsampled_shape
+        )
     fourier_array = jnp.fft.fftshift(fftn(image_or_volume))
     cropped_fourier_array = crop_to_shape(fourier_array, downsampled_shape)
     if get_real:
@@ -130,3 +135,30 @@ def downsample_to_shape_with_fourier_cropping(
         return jnp.fft.ifftshift(cropped_fourier_array)[
             ..., : downsampled_shape[-1] // 2 + 1
         ]
+
+
+def _downsample_to_rfft_with_fourier_cropping(
+    image_or_volume: Float[Array, "_ _"] | Float[Array, "_ _ _"],
+    downsampled_shape: tuple[int, int] | tuple[int, int, int],
+) -> Complex[Array, "_ _"] | Complex[Array, "_ _ _"]:
+    leading_axes = tuple(range(image_or_volume.ndim - 1))
+    fourier_array = rfftn(image_or_volume)
+    # Only the leading axes need to be cropped around the zero frequency component
+    n_x = downsampled_shape[-1]
+    cropped_fourier_array = fourier_array[..., : n_x // 2 + 1]
+    if n_x % 2 == 0:
+        # ... cropping the full spectrum puts the frequency -n_x/2 rather than +n_x/2
+        # in the last column, so fill it in with hermitian symmetry
+        nyquist_frequencies = jnp.conj(
+            jnp.roll(
+                jnp.flip(fourier_array[..., n_x // 2], axis=leading_axes),
+                1,
+                axis=leading_axes,
+            )
+        )
+        cropped_fourier_array = cropped_fourier_array.at[..., -1].set(nyquist_frequencies)
+    cropped_fourier_array = crop_to_shape(
+        jnp.fft.fftshift(cropped_fourier_array, axes=leading_axes),
+        (*downsampled_shape[:-1], n_x // 2 + 1),  # type: ignore
+    )
+    return jnp.fft.ifftshift(cropped_fourier_array, axes=leading_axes)
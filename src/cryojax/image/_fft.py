@@ -97,3 +97,33 @@ def rfftn(
     ft = jnp.fft.rfftn(jnp.fft.ifftshift(ift, axes=axes), s=s, axes=axes)
 
     return ft
+
+
+def compute_fast_fft_length(n: int) -> int:
+    """Compute the smallest integer greater than or equal to `n`
+    whose only prime factors are 2, 3, and 5. FFTs of such lengths
+    are efficient, so this is useful for choosing a padded shape
+    that is not much larger than the original.
+
+    Arguments
+    ---------
+    n :
+        The minimum length.
+
+    Returns
+    -------
+    fast_length :
+        The smallest length greater than or equal to `n` with
+        prime factors 2, 3, and 5.
+    """
+    if n < 1:
+        raise ValueError(f"`n` must be a positive integer. Got a value of {n}.")
+    fast_length = n
+    while True:
+        remainder = fast_length
+        for prime in (2, 3, 5):
+            while remainder % prime == 0:
+                remainder //= prime
+        if remainder == 1:
+            return fast_length
+        fast_length += 1
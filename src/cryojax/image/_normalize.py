@@ -86,14 +86,23 @@ def rescale_image(
             else N1 * N2
         )
         image_with_zero_mean = image.at[0, 0].set(0.0)
-        image_std = (
-            jnp.sqrt(
-                jnp.sum(jnp.abs(image_with_zero_mean[:, 0]) ** 2)
-                + 2 * jnp.sum(jnp.abs(image_with_zero_mean[:, 1:]) ** 2)
+        if is_rfft:
+            # ... all but the zero frequency column are counted twice on the
+            # half space, as well as the nyquist column for an even shape
+            has_nyquist_column = (
+                shape_in_real_space is not None and shape_in_real_space[1] % 2 == 0
             )
-            if is_rfft
-            else jnp.linalg.norm(image_with_zero_mean)
-        ) / n_pixels
+            power_spectrum = image_with_zero_mean.real**2 + image_with_zero_mean.imag**2
+            image_std = (
+                jnp.sqrt(
+                    2 * jnp.sum(power_spectrum)
+                    - jnp.sum(power_spectrum[:, 0])
+                    - (jnp.sum(power_spectrum[:, -1]) if has_nyquist_column else 0.0)
+                )
+                / n_pixels
+            )
+        else:
+            image_std = jnp.linalg.norm(image_with_zero_mean) / n_pixels
         normalized_image = image_with_zero_mean / image_std
         rescaled_image = (normalized_image * std).at[0, 0].set(mean * n_pixels)
     return rescaled_image
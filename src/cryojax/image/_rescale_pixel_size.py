@@ -10,6 +10,7 @@ from jax.image import scale_and_translate
 from jaxtyping import Array, Complex, Float, Inexact
 
 from ._fft import fftn, ifftn, irfftn, rfftn
+from ._map_coordinates import map_coordinates
 
 
 def rescale_pixel_size(
@@ -69,6 +70,72 @@ def rescale_pixel_size(
     return rescaled_image
 
 
+def rescale_pixel_size_in_fourier_space(
+    fourier_image: (Complex[Array, "y_dim x_dim//2+1"] | Complex[Array, "y_dim x_dim"]),
+    current_pixel_size: Float[Array, ""],
+    new_pixel_size: Float[Array, ""],
+    is_hermitian_symmetric: bool = True,
+    interpolation_order: int = 3,
+) -> Complex[Array, "y_dim x_dim//2+1"] | Complex[Array, "y_dim x_dim"]:
+    """
+    Measure an image at a given pixel size by interpolating its fourier
+    transform, avoiding a round-trip to real space.
+
+    The fourier transform is assumed to be in `cryojax` conventions, with
+    the zero frequency component in the corner and the origin of real space
+    at the center of the image. The pixel size is then changed by sampling the
+    fourier transform at frequencies rescaled by
+    ``current_pixel_size / new_pixel_size`` with interpolation. Frequencies
+    that are not sampled by ``fourier_image`` are set to zero, so downsampling is
+    anti-aliased.
+
+    Parameters
+    ----------
+    fourier_image :
+        The fourier transform of the image to be magnified.
+    current_pixel_size :
+        The pixel size of the input image.
+    new_pixel_size :
+        The new pixel size after interpolation.
+    is_hermitian_symmetric :
+        If ``True``, ``fourier_image`` is the output of ``rfftn``. Otherwise,
+        it is the output of ``fftn``.
+    interpolation_order :
+        The order of interpolation in fourier space, either ``1`` for linear
+        interpolation or ``3`` for cubic spline interpolation.
+
+    Returns
+    -------
+    rescaled_fourier_image :
+        The fourier transform of an image with pixels whose size are rescaled by
+        ``current_pixel_size / new_pixel_size``.
+    """
+    # Compute scale factor for pixel size rescaling
+    scale_factor = current_pixel_size / new_pixel_size
+    # Get the frequencies of the new image in units of the old image's
+    # frequency spacing, as indices in the old image with its zero frequency
+    # component in the center
+    fourier_image = jnp.fft.fftshift(
+        fourier_image, axes=(0,) if is_hermitian_symmetric else (0, 1)
+    )
+    N1, N2 = fourier_image.shape
+    k1 = scale_factor * jnp.fft.fftshift(jnp.fft.fftfreq(N1) * N1) + N1 // 2
+    if is_hermitian_symmetric:
+        k2 = scale_factor * jnp.arange(N2, dtype=float)
+    else:
+        k2 = scale_factor * jnp.fft.fftshift(jnp.fft.fftfreq(N2) * N2) + N2 // 2
+    coordinates = jnp.meshgrid(k1, k2, indexing="ij")
+    # Interpolate and normalize in the conventions of an FFT of an image
+    # whose values are interpolated in real space
+    rescaled_fourier_image = scale_factor**2 * map_coordinates(
+        fourier_image, coordinates, order=interpolation_order, mode="fill", cval=0.0
+    )
+
+    return jnp.fft.ifftshift(
+        rescaled_fourier_image, axes=(0,) if is_hermitian_symmetric else (0, 1)
+    )
+
+
 def maybe_rescale_pixel_size(
     real_or_fourier_image: (
         Inexact[Array, "padded_y_dim padded_x_dim"]
@@ -85,8 +152,29 @@ def maybe_rescale_pixel_size(
     | Complex[Array, "padded_y_dim padded_x_dim//2+1"]
 ):
     """Rescale the image pixel size using real-space interpolation. Only
-    interpolate if the `pixel_size` is not the `current_pixel_size`."""
-    if is_real:
+    interpolate if the `pixel_size` is not the `current_pixel_size`.
+
+    If `method = "fourier"`, instead interpolate a fourier-space image
+    directly in fourier space with `rescale_pixel_size_in_fourier_space`. This
+    avoids computing FFTs, but it is only supported if `is_real = False`.
+
+    If both pixel sizes are known at trace time, the check is resolved in
+    python and only the branch that runs is traced. Otherwise, the branch
+    is chosen at runtime with `jax.lax.cond`.
+    """
+    if method == "fourier":
+        if is_real:
+            raise ValueError(
+                "Rescaling the pixel size with `method = 'fourier'` is only "
+                "supported for images in fourier space, but got `is_real = True`."
+            )
+        rescale_fn = lambda im: rescale_pixel_size_in_fourier_space(
+            im,
+            current_pixel_size,
+            new_pixel_size,
+            is_hermitian_symmetric=is_hermitian_symmetric,
+        )
+    elif is_real:
         rescale_fn = lambda im: rescale_pixel_size(
             im, current_pixel_size, new_pixel_size, method=method
         )
@@ -130,9 +218,13 @@ def maybe_rescale_pixel_size(
                     )
                 )
     null_fn = lambda im: im
-    return jax.lax.cond(
-        jnp.isclose(current_pixel_size, new_pixel_size),
-        null_fn,
-        rescale_fn,
-        real_or_fourier_image,
-    )
+    is_pixel_size_close = jnp.isclose(current_pixel_size, new_pixel_size)
+    if isinstance(is_pixel_size_close, jax.core.Tracer):
+        return jax.lax.cond(
+            is_pixel_size_close, null_fn, rescale_fn, real_or_fourier_image
+        )
+    else:
+        if is_pixel_size_close:
+            return null_fn(real_or_fourier_image)
+        else:
+            return rescale_fn(real_or_fourier_image)
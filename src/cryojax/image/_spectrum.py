@@ -42,7 +42,7 @@ def compute_radially_averaged_powerspectrum(
     over which it is computed.
     """
     # Compute squared amplitudes
-    squared_fourier_amplitudes = (fourier_image * jnp.conjugate(fourier_image)).real
+    squared_fourier_amplitudes = fourier_image.real**2 + fourier_image.imag**2
     # Compute bins
     q_min = 0.0 if minimum_frequency is None else minimum_frequency
     q_max = (
@@ -69,7 +69,7 @@ class ZeroMode(AbstractFourierOperator, strict=True):
         self, frequency_grid: Float[Array, "y_dim x_dim 2"]
     ) -> Float[Array, "y_dim x_dim"]:
         N1, N2 = frequency_grid.shape[0:-1]
-        return jnp.zeros((N1, N2)).at[0, 0].set(self.value)
+        return jnp.zeros((N1, N2), dtype=frequency_grid.dtype).at[0, 0].set(self.value)
 
 
 ZeroMode.__init__.__doc__ = """**Arguments:**
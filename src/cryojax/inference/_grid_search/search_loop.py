@@ -90,6 +90,8 @@ def run_grid_search(
     # Get the initial state of the search method
     init_state = method.init(tree_grid, f_struct, is_leaf=is_leaf)
     dynamic_init_state, static_state = eqx.partition(init_state, eqx.is_array)
+    # Get the size of the grid
+    grid_size = math.prod(tree_grid_shape(tree_grid, is_leaf=is_leaf))
     # Finally, build the loop
     init_carry = (dynamic_init_state, tree_grid)
 
@@ -114,6 +116,8 @@ def run_grid_search(
             method.batch_size,  # type: ignore
             dtype=jnp.int32,
         )
+        # ... pad a ragged final batch by repeating the last grid point
+        raveled_grid_index_batch = jnp.minimum(raveled_grid_index_batch, grid_size - 1)
         tree_grid_points = tree_grid_take(
             tree_grid,
             tree_grid_unravel_index(raveled_grid_index_batch, tree_grid, is_leaf=is_leaf),
@@ -125,8 +129,7 @@ def run_grid_search(
         assert eqx.tree_equal(static_state, new_static_state) is True
         return new_dynamic_state, tree_grid
 
-    # Get the number of iterations of the loop (the size of the grid)
-    grid_size = math.prod(tree_grid_shape(tree_grid, is_leaf=is_leaf))
+    # Get the number of iterations of the loop
     if method.batch_size is None:
         n_iterations = grid_size
         body_fun = brute_force_body_fun
@@ -145,12 +148,8 @@ def run_grid_search(
         body_fun = fori_loop_tqdm_decorator(n_iterations, print_every)(body_fun)
     final_carry = jax.lax.fori_loop(0, n_iterations, body_fun, init_carry)
     if method.batch_size is not None and grid_size % method.batch_size != 0:
-        final_carry = jax.lax.fori_loop(
-            n_iterations,
-            n_iterations + (grid_size % method.batch_size),
-            batched_body_fun,
-            final_carry,
-        )
+        # ... evaluate the remaining grid points in a final, padded batch
+        final_carry = batched_body_fun(n_iterations, final_carry)
     dynamic_final_state, _ = final_carry
     final_state = eqx.combine(static_state, dynamic_final_state)
     # Return the solution
@@ -3,15 +3,17 @@ Image formation models simulated from gaussian noise distributions.
 """
 
 from abc import abstractmethod
+from functools import partial
 from typing import Optional
 from typing_extensions import override
 
+import jax
 import jax.numpy as jnp
 import jax.random as jr
 from equinox import AbstractVar, field
 from jaxtyping import Array, Complex, Float, PRNGKeyArray
 
-from ...image import rfftn
+from ...image import normalize_image, rfftn
 from ...image.operators import Constant, FourierOperatorLike
 from ...internal import error_if_not_positive
 from ...simulator import AbstractImagingPipeline
@@ -47,9 +49,21 @@ class AbstractGaussianDistribution(AbstractDistribution, strict=True):
         ]
     ):
         """Sample from the gaussian noise model."""
-        return self.compute_signal(get_real=get_real) + self.compute_noise(
-            rng_key, get_real=get_real
-        )
+        if self.is_signal_normalized:
+            return self.compute_signal(get_real=get_real) + self.compute_noise(
+                rng_key, get_real=get_real
+            )
+        else:
+            # ... postprocessing is linear, so add the signal and the noise at the
+            # padded shape in fourier space and then postprocess once, rather
+            # than moving each back and forth between real and fourier space
+            pipeline = self.imaging_pipeline
+            return pipeline.postprocess(
+                self.signal_scale_factor
+                * pipeline.render(get_cropped=False, get_real=False)
+                + self._compute_padded_noise_spectrum(rng_key),
+                get_real=get_real,
+            )
 
     @override
     def compute_signal(
@@ -68,6 +82,14 @@ class AbstractGaussianDistribution(AbstractDistribution, strict=True):
     ):
         """Render the image formation model."""
         if self.is_signal_normalized:
+            if self.imaging_pipeline.mask is None and not get_real:
+                # ... without a mask, normalize in fourier space rather than
+                # moving back and forth between real and fourier space
+                return normalize_image(
+                    self.imaging_pipeline.render(get_real=False),
+                    is_real=False,
+                    shape_in_real_space=self.imaging_pipeline.instrument_config.shape,
+                )
             simulated_image = self.imaging_pipeline.render(
                 get_real=True, get_masked=False
             )
@@ -109,6 +131,19 @@ class AbstractGaussianDistribution(AbstractDistribution, strict=True):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def _compute_padded_noise_spectrum(
+        self, rng_key: PRNGKeyArray
+    ) -> Complex[
+        Array,
+        "{self.imaging_pipeline.instrument_config.padded_y_dim} "
+        "{self.imaging_pipeline.instrument_config.padded_x_dim//2+1}",
+    ]:
+        """Draw a realization from the gaussian noise model in fourier space at
+        the padded shape, before postprocessing.
+        """
+        raise NotImplementedError
+
 
 class IndependentGaussianPixels(AbstractGaussianDistribution, strict=True):
     r"""A gaussian noise model, where each pixel is independently drawn from
@@ -161,23 +196,28 @@ class IndependentGaussianPixels(AbstractGaussianDistribution, strict=True):
             "{self.imaging_pipeline.instrument_config.x_dim//2+1}",
         ]
     ):
+        return self.imaging_pipeline.postprocess(
+            self._compute_padded_noise_spectrum(rng_key), get_real=get_real
+        )
+
+    @override
+    def _compute_padded_noise_spectrum(
+        self, rng_key: PRNGKeyArray
+    ) -> Complex[
+        Array,
+        "{self.imaging_pipeline.instrument_config.padded_y_dim} "
+        "{self.imaging_pipeline.instrument_config.padded_x_dim//2+1}",
+    ]:
         pipeline = self.imaging_pipeline
         n_pixels = pipeline.instrument_config.padded_n_pixels
         freqs = pipeline.instrument_config.padded_frequency_grid_in_angstroms
         # Compute the zero mean variance and scale up to be independent of the number of
         # pixels
         std = jnp.sqrt(n_pixels * self.variance)
-        noise = pipeline.postprocess(
-            std
-            * jr.normal(rng_key, shape=freqs.shape[0:-1])
-            .at[0, 0]
-            .set(0.0)
-            .astype(complex),
-            get_real=get_real,
+        return std * jr.normal(rng_key, shape=freqs.shape[0:-1]).at[0, 0].set(0.0).astype(
+            complex
         )
 
-        return noise
-
     @override
     def log_likelihood(
         self,
@@ -193,21 +233,12 @@ class IndependentGaussianPixels(AbstractGaussianDistribution, strict=True):
 
         - `observed` : The observed data in real space.
         """
-        variance = self.variance
         # Create simulated data
         simulated = self.compute_signal(get_real=True)
-        # Compute residuals
-        residuals = simulated - observed
-        # Compute standard normal random variables
-        squared_standard_normal_per_pixel = jnp.abs(residuals) ** 2 / (2 * variance)
-        # Compute the log-likelihood for each pixel.
-        log_likelihood_per_pixel = -1.0 * (
-            squared_standard_normal_per_pixel - jnp.log(2 * jnp.pi * variance) / 2
+        # Compute the log-likelihood in a single compiled kernel
+        return _compute_log_likelihood_of_independent_pixels(
+            simulated, observed, self.variance
         )
-        # Compute log-likelihood, summing over pixels
-        log_likelihood = jnp.sum(log_likelihood_per_pixel)
-
-        return log_likelihood
 
 
 class IndependentGaussianFourierModes(AbstractGaussianDistribution, strict=True):
@@ -243,7 +274,7 @@ class IndependentGaussianFourierModes(AbstractGaussianDistribution, strict=True)
         """  # noqa: E501
         self.imaging_pipeline = imaging_pipeline
         self.variance_function = variance_function or Constant(1.0)
-        self.signal_scale_factor = error_if_not_positive(jnp.asarray(signal_scale_factor))
+        self.signal_scale_factor = error_if_not_positive(signal_scale_factor)
         self.is_signal_normalized = is_signal_normalized
 
     def compute_noise(
@@ -260,23 +291,28 @@ class IndependentGaussianFourierModes(AbstractGaussianDistribution, strict=True)
             "{self.imaging_pipeline.instrument_config.x_dim//2+1}",
         ]
     ):
+        return self.imaging_pipeline.postprocess(
+            self._compute_padded_noise_spectrum(rng_key), get_real=get_real
+        )
+
+    @override
+    def _compute_padded_noise_spectrum(
+        self, rng_key: PRNGKeyArray
+    ) -> Complex[
+        Array,
+        "{self.imaging_pipeline.instrument_config.padded_y_dim} "
+        "{self.imaging_pipeline.instrument_config.padded_x_dim//2+1}",
+    ]:
         pipeline = self.imaging_pipeline
         n_pixels = pipeline.instrument_config.padded_n_pixels
         freqs = pipeline.instrument_config.padded_frequency_grid_in_angstroms
         # Compute the zero mean variance and scale up to be independent of the number of
         # pixels
         std = jnp.sqrt(n_pixels * self.variance_function(freqs))
-        noise = pipeline.postprocess(
-            std
-            * jr.normal(rng_key, shape=freqs.shape[0:-1])
-            .at[0, 0]
-            .set(0.0)
-            .astype(complex),
-            get_real=get_real,
+        return std * jr.normal(rng_key, shape=freqs.shape[0:-1]).at[0, 0].set(0.0).astype(
+            complex
         )
 
-        return noise
-
     @override
     def log_likelihood(
         self,
@@ -299,23 +335,54 @@ class IndependentGaussianFourierModes(AbstractGaussianDistribution, strict=True)
         variance = n_pixels * self.variance_function(freqs)
         # Create simulated data
         simulated = self.compute_signal(get_real=False)
-        # Compute residuals
-        residuals = simulated - observed
-        # Compute standard normal random variables
-        squared_standard_normal_per_mode = jnp.abs(residuals) ** 2 / (2 * variance)
-        # Compute the log-likelihood for each fourier mode.
-        log_likelihood_per_mode = (
-            squared_standard_normal_per_mode - jnp.log(2 * jnp.pi * variance) / 2
-        )
-        # Compute log-likelihood, throwing away the zero mode. Need to take care
-        # to compute the loss function in fourier space for a real-valued function.
-        log_likelihood = (
-            -1.0
-            * (
-                jnp.sum(log_likelihood_per_mode[1:, 0])
-                + 2 * jnp.sum(log_likelihood_per_mode[:, 1:])
-            )
-            / n_pixels
+        # Compute the log-likelihood in a single compiled kernel
+        return _compute_log_likelihood_of_independent_fourier_modes(
+            simulated, observed, variance, n_pixels
         )
 
-        return log_likelihood
+
+@jax.jit
+def _compute_log_likelihood_of_independent_pixels(
+    simulated: Float[Array, "y_dim x_dim"],
+    observed: Float[Array, "y_dim x_dim"],
+    variance: Float[Array, ""],
+) -> Float[Array, ""]:
+    # Compute residuals
+    residuals = simulated - observed
+    # Compute standard normal random variables
+    squared_standard_normal_per_pixel = residuals**2 / (2 * variance)
+    # Compute the log-likelihood for each pixel.
+    log_likelihood_per_pixel = -1.0 * (
+        squared_standard_normal_per_pixel - jnp.log(2 * jnp.pi * variance) / 2
+    )
+    # Compute log-likelihood, summing over pixels
+    return jnp.sum(log_likelihood_per_pixel)
+
+
+@partial(jax.jit, static_argnums=(3,))
+def _compute_log_likelihood_of_independent_fourier_modes(
+    simulated: Complex[Array, "y_dim x_dim"],
+    observed: Complex[Array, "y_dim x_dim"],
+    variance: Float[Array, ""] | Float[Array, "y_dim x_dim"],
+    n_pixels: int,
+) -> Float[Array, ""]:
+    # Compute residuals
+    residuals = simulated - observed
+    # Compute standard normal random variables
+    squared_standard_normal_per_mode = (residuals.real**2 + residuals.imag**2) / (
+        2 * variance
+    )
+    # Compute the log-likelihood for each fourier mode.
+    log_likelihood_per_mode = (
+        squared_standard_normal_per_mode - jnp.log(2 * jnp.pi * variance) / 2
+    )
+    # Compute log-likelihood, throwing away the zero mode. Need to take care
+    # to compute the loss function in fourier space for a real-valued function.
+    return (
+        -1.0
+        * (
+            jnp.sum(log_likelihood_per_mode[1:, 0])
+            + 2 * jnp.sum(log_likelihood_per_mode[:, 1:])
+        )
+        / n_pixels
+    )
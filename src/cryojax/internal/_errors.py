@@ -2,34 +2,48 @@
 Utilities for runtime errors, wrapping `equinox.error_if`.
 """
 
+from typing import Callable
+
 import equinox as eqx
 import jax.numpy as jnp
+import numpy as np
 from jaxtyping import Array, ArrayLike
 
 
 def error_if_negative(x: ArrayLike) -> Array:
-    x = jnp.asarray(x)
-    return eqx.error_if(x, x < 0, "A non-negative quantity was found to be negative!")
+    return _error_if(
+        x, lambda x: x < 0, "A non-negative quantity was found to be negative!"
+    )
 
 
 def error_if_not_positive(x: ArrayLike) -> Array:
-    x = jnp.asarray(x)
-    return eqx.error_if(
-        x, x <= 0, "A positive quantity was found to be negative or zero!"
+    return _error_if(
+        x, lambda x: x <= 0, "A positive quantity was found to be negative or zero!"
     )
 
 
 def error_if_zero(x: ArrayLike) -> Array:
-    x = jnp.asarray(x)
-    return eqx.error_if(
-        x, jnp.isclose(x, 0.0), "A non-zero quantity was found to be zero!"
+    # ... equivalent to `isclose(x, 0.0)`
+    return _error_if(
+        x, lambda x: abs(x) <= 1e-8, "A non-zero quantity was found to be zero!"
     )
 
 
 def error_if_not_fractional(x: ArrayLike) -> Array:
-    x = jnp.asarray(x)
-    return eqx.error_if(
+    return _error_if(
         x,
-        ~jnp.logical_and(x >= 0.0, x <= 1.0),
+        lambda x: (x < 0.0) | (x > 1.0),
         "A fractional quantity was found to not be between 0 and 1!",
     )
+
+
+def _error_if(x: ArrayLike, is_error: Callable, msg: str) -> Array:
+    if isinstance(x, (int, float, np.ndarray, np.generic)):
+        # ... python and numpy values can be checked on the host, rather than
+        # dispatching the check to the device and waiting for the result
+        if np.any(is_error(np.asarray(x))):
+            raise eqx.EquinoxRuntimeError(msg)
+        return jnp.asarray(x)
+    else:
+        x = jnp.asarray(x)
+        return eqx.error_if(x, is_error(x), msg)
@@ -85,9 +85,14 @@ class SO3(AbstractMatrixLieGroup, strict=True):
 
     @override
     def apply(self, target: Float[Array, "3"]) -> Float[Array, "3"]:
-        # Compute using quaternion multiplys.
-        padded_target = jnp.concatenate([jnp.zeros(1), target])
-        return (self @ SO3(wxyz=padded_target) @ self.inverse()).wxyz[1:]
+        # Compute the quaternion product q * (0, v) * q^*, written out in closed
+        # form so that the conjugate quaternion is never constructed
+        w, xyz = self.wxyz[0], self.wxyz[1:]
+        return (
+            (w**2 - xyz @ xyz) * target
+            + 2 * (xyz @ target) * xyz
+            + 2 * w * jnp.cross(xyz, target)
+        )
 
     @override
     def compose(self, other: Self) -> Self:
@@ -209,15 +214,20 @@ class SO3(AbstractMatrixLieGroup, strict=True):
 
     @override
     def as_matrix(self) -> Float[Array, "3 3"]:
-        norm = self.wxyz @ self.wxyz
-        q = self.wxyz * jnp.sqrt(2.0 / norm)
-        q = jnp.outer(q, q)
-        return jnp.array(
+        # Build the matrix from the bilinear products of the quaternion
+        # components, elementwise so that any leading batch dimensions broadcast
+        w, x, y, z = jnp.moveaxis(self.wxyz, -1, 0)
+        scale = 2.0 / (w * w + x * x + y * y + z * z)
+        xx, yy, zz = scale * x * x, scale * y * y, scale * z * z
+        xy, xz, yz = scale * x * y, scale * x * z, scale * y * z
+        wx, wy, wz = scale * w * x, scale * w * y, scale * w * z
+        return jnp.stack(
             [
-                [1.0 - q[2, 2] - q[3, 3], q[1, 2] - q[3, 0], q[1, 3] + q[2, 0]],
-                [q[1, 2] + q[3, 0], 1.0 - q[1, 1] - q[3, 3], q[2, 3] - q[1, 0]],
-                [q[1, 3] - q[2, 0], q[2, 3] + q[1, 0], 1.0 - q[1, 1] - q[2, 2]],
-            ]
+                jnp.stack([1.0 - yy - zz, xy - wz, xz + wy], axis=-1),
+                jnp.stack([xy + wz, 1.0 - xx - zz, yz - wx], axis=-1),
+                jnp.stack([xz - wy, yz + wx, 1.0 - xx - yy], axis=-1),
+            ],
+            axis=-2,
         )
 
     @classmethod
@@ -60,16 +60,16 @@ class IdealCountingDQE(AbstractDQE, strict=True):
         *,
         pixel_size: Optional[Float[Array, ""]] = None,
     ) -> Float[Array, "y_dim x_dim"]:
+        # The sinc is evaluated at half the frequency in nyquist units, which is the
+        # frequency in pixels
         if pixel_size is None:
-            frequency_grid_in_nyquist_units = frequency_grid_in_angstroms_or_pixels / 0.5
+            frequency_grid_in_pixels = frequency_grid_in_angstroms_or_pixels
         else:
-            frequency_grid_in_nyquist_units = (
-                frequency_grid_in_angstroms_or_pixels * pixel_size
-            ) / 0.5
+            frequency_grid_in_pixels = frequency_grid_in_angstroms_or_pixels * pixel_size
         return (
             self.fraction_detected_electrons**2
-            * jnp.sinc(frequency_grid_in_nyquist_units[..., 0] / 2) ** 2
-            * jnp.sinc(frequency_grid_in_nyquist_units[..., 1] / 2) ** 2
+            * jnp.sinc(frequency_grid_in_pixels[..., 0]) ** 2
+            * jnp.sinc(frequency_grid_in_pixels[..., 1]) ** 2
         )
 
 
@@ -170,16 +170,16 @@ class AbstractDetector(Module, strict=True):
         )
         # ... now the total number of electrons over the entire image
         electrons_per_image = N_pix * electrons_per_pixel
-        # Normalize the squared wavefunction to a set of probabilities
-        fourier_squared_wavefunction_at_detector_plane /= (
-            fourier_squared_wavefunction_at_detector_plane[0, 0]
+        # Normalize the squared wavefunction to a set of probabilities, apply the
+        # DQE, and apply the integrated dose rate. Combine these factors so that the
+        # squared wavefunction is only scaled once
+        normalization = (
+            electrons_per_image / fourier_squared_wavefunction_at_detector_plane[0, 0]
         )
-        # Compute the noiseless signal by applying the DQE to the squared wavefunction
-        fourier_signal = fourier_squared_wavefunction_at_detector_plane * jnp.sqrt(
-            self.dqe(frequency_grid)
+        fourier_expected_electron_events = (
+            fourier_squared_wavefunction_at_detector_plane
+            * (normalization * jnp.sqrt(self.dqe(frequency_grid)))
         )
-        # Apply the integrated dose rate
-        fourier_expected_electron_events = electrons_per_image * fourier_signal
         if key is None:
             # If there is no key given, return
             return fourier_expected_electron_events
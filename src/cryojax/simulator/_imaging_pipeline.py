@@ -54,6 +54,15 @@ class AbstractImagingPipeline(Module, strict=True):
     ):
         """Render an image without any stochasticity.
 
+        !!! info
+            Rendering works on arrays at the `InstrumentConfig.padded_shape`.
+            Under `jax.jit`, the elementwise operations on these arrays (such
+            as applying the CTF, the envelope, and filters) are fused with
+            one another, so only a few padded arrays are held in memory at a
+            time. To reduce the memory footprint further, see
+            `LinearSuperpositionScatteringTheory.batch_size` and
+            `GaussianMixtureProjection.atom_groups_in_series`.
+
         **Arguments:**
 
         - `rng_key`:
@@ -109,10 +118,9 @@ class AbstractImagingPipeline(Module, strict=True):
             # ... otherwise, apply filter, crop, and mask, again trying to
             # minimize moving back and forth between real and fourier space
             is_filter_applied = True if self.filter is None else False
-            if (
-                self.filter is not None
-                and self.filter.array.shape
-                == instrument_config.padded_frequency_grid_in_pixels.shape[0:2]
+            if self.filter is not None and self.filter.array.shape == (
+                instrument_config.padded_y_dim,
+                instrument_config.padded_x_dim // 2 + 1,
             ):
                 # ... apply the filter here if it is the same size as the padded
                 # coordinates
@@ -13,6 +13,7 @@ from jaxtyping import Array, Float, Inexact
 from ..constants import convert_keV_to_angstroms
 from ..coordinates import make_coordinate_grid, make_frequency_grid
 from ..image import (
+    compute_fast_fft_length,
     crop_to_shape,
     pad_to_shape,
     resize_with_crop_or_pad,
@@ -41,6 +42,7 @@ class InstrumentConfig(Module, strict=True):
         *,
         pad_scale: float = 1.0,
         pad_mode: Union[str, Callable] = "constant",
+        pad_to_fast_fft_shape: bool = False,
     ):
         """**Arguments:**
 
@@ -62,21 +64,32 @@ class InstrumentConfig(Module, strict=True):
         - `pad_mode`:
             The method of image padding. By default, `"constant"`.
             For all options, see `jax.numpy.pad`.
+        - `pad_to_fast_fft_shape`:
+            If `True`, round each dimension of the `padded_shape` set by
+            `pad_scale` up to the nearest length whose only prime factors are
+            2, 3, and 5, for which FFTs are efficient. If `padded_shape` is set,
+            this argument is ignored.
         """
-        self.shape = shape
-        self.pixel_size = error_if_not_positive(jnp.asarray(pixel_size))
-        self.voltage_in_kilovolts = error_if_not_positive(
-            jnp.asarray(voltage_in_kilovolts)
-        )
+        # Store shapes as tuples of python integers, so that they are static
+        # under `equinox.filter_jit`
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.pixel_size = error_if_not_positive(pixel_size)
+        self.voltage_in_kilovolts = error_if_not_positive(voltage_in_kilovolts)
         self.electrons_per_angstrom_squared = error_if_not_positive(
-            jnp.asarray(electrons_per_angstrom_squared)
+            electrons_per_angstrom_squared
         )
         self.pad_mode = pad_mode
         # Set shape after padding
         if padded_shape is None:
-            self.padded_shape = (int(pad_scale * shape[0]), int(pad_scale * shape[1]))
-        else:
+            padded_shape = (int(pad_scale * shape[0]), int(pad_scale * shape[1]))
+            if pad_to_fast_fft_shape:
+                padded_shape = (
+                    compute_fast_fft_length(padded_shape[0]),
+                    compute_fast_fft_length(padded_shape[1]),
+                )
             self.padded_shape = padded_shape
+        else:
+            self.padded_shape = (int(padded_shape[0]), int(padded_shape[1]))
 
     def __check_init__(self):
         if self.padded_shape[0] < self.shape[0] or self.padded_shape[1] < self.shape[1]:
@@ -85,14 +98,14 @@ class InstrumentConfig(Module, strict=True):
                 "more dimensions."
             )
 
-    @property
+    @cached_property
     def wavelength_in_angstroms(self) -> Float[Array, ""]:
         """The incident electron wavelength corresponding to the beam
         energy `voltage_in_kilovolts`.
         """
         return convert_keV_to_angstroms(self.voltage_in_kilovolts)
 
-    @property
+    @cached_property
     def wavenumber_in_inverse_angstroms(self) -> Float[Array, ""]:
         """The incident electron wavenumber corresponding to the beam
         energy `voltage_in_kilovolts`.
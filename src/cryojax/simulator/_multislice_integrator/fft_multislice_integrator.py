@@ -6,8 +6,6 @@ import jax.numpy as jnp
 from equinox import error_if
 from jaxtyping import Array, Complex
 
-from cryojax.image import fftn, ifftn
-
 from .._instrument_config import InstrumentConfig
 from .._potential_representation import (
     AbstractAtomicPotential,
@@ -159,12 +157,17 @@ class FFTMultisliceIntegrator(
         )
         # Prepare for iteration. First, initialize plane wave
         plane_wave = jnp.ones((y_dim, x_dim), dtype=complex)
-        # ... stepping function
-        make_step = lambda n, last_exit_wave: ifftn(
-            fftn(transmission[n, :, :] * last_exit_wave) * fresnel_propagator
+        # ... stepping function. Propagation is a convolution, which commutes with
+        # shifting the zero frequency component, so use `jax.numpy.fft` directly
+        # rather than shifting back and forth at every step
+        make_step = lambda last_exit_wave, transmission_per_slice: (
+            jnp.fft.ifftn(
+                jnp.fft.fftn(transmission_per_slice * last_exit_wave) * fresnel_propagator
+            ),
+            None,
         )
         # Compute exit wave
-        exit_wave = jax.lax.fori_loop(0, n_slices, make_step, plane_wave)
+        exit_wave, _ = jax.lax.scan(make_step, plane_wave, transmission[:n_slices])
 
         # return (
         #    exit_wave
@@ -2,6 +2,7 @@
 Representations of rigid body rotations and translations of 3D coordinate systems.
 """
 
+import dataclasses
 from abc import abstractmethod
 from functools import cached_property
 from typing_extensions import override, Self
@@ -61,22 +62,46 @@ class AbstractPose(Module, strict=True):
 
         The rotated version of `coordinate_grid_or_list`.
         """
-        rotation = self.rotation.inverse() if inverse else self.rotation
-        if isinstance(coordinate_grid_or_list, Float[Array, "size 3"]):  # type: ignore
-            rotated_coordinate_grid_or_list = jax.vmap(rotation.apply)(
-                coordinate_grid_or_list
-            )
-        elif isinstance(coordinate_grid_or_list, Float[Array, "z_dim y_dim x_dim 3"]):  # type: ignore
-            rotated_coordinate_grid_or_list = jax.vmap(
-                jax.vmap(jax.vmap(rotation.apply))
-            )(coordinate_grid_or_list)
-        else:
-            raise ValueError(
-                "Coordinates must be a JAX array either of shape (N, 3) or "
-                f"(N1, N2, N3, 3). Instead, got {coordinate_grid_or_list.shape} and type "
-                f"{type(coordinate_grid_or_list)}."
-            )
-        return rotated_coordinate_grid_or_list
+        _check_coordinates(coordinate_grid_or_list)
+        return _rotate_coordinates(
+            self, coordinate_grid_or_list, inverse, is_batched=False
+        )
+
+    def rotate_coordinates_batched(
+        self,
+        coordinate_grid_or_list: (
+            Float[Array, "z_dim y_dim x_dim 3"] | Float[Array, "size 3"]
+        ),
+        inverse: bool = False,
+    ) -> Float[Array, "*batch z_dim y_dim x_dim 3"] | Float[Array, "*batch size 3"]:
+        """Rotate a 3D coordinate system by each pose in a batch of poses.
+
+        Any of the rotation parameters may have leading batch dimensions, for
+        example if the pose was created with `equinox.filter_vmap`, possibly
+        with `in_axes` on only some of the parameters. The coordinates are
+        rotated by each pose in one computation. The in-plane offsets do not
+        enter the rotation, so batch dimensions on only the offsets are
+        ignored.
+
+        **Arguments:**
+
+        - `coordinate_grid_or_list`:
+            The 3D coordinate system to rotate. This can either be a list of coordinates
+            of shape `(N, 3)` or a grid of coordinates `(N1, N2, N3, 3)`.
+        - `inverse`:
+            If `True`, compute the inverse rotation (i.e. rotation by the matrix $R^T$,
+            where $R$ is the rotation matrix).
+
+        **Returns:**
+
+        The rotated versions of `coordinate_grid_or_list`, with leading
+        dimensions given by the broadcasted batch dimensions of the rotation
+        parameters.
+        """
+        _check_coordinates(coordinate_grid_or_list)
+        return _rotate_coordinates(
+            self, coordinate_grid_or_list, inverse, is_batched=True
+        )
 
     def compute_shifts(
         self, frequency_grid_in_angstroms: Float[Array, "y_dim x_dim 2"]
@@ -94,8 +119,17 @@ class AbstractPose(Module, strict=True):
         From the vector $(t_x, t_y)$ (given by `self.offset_in_angstroms`), returns the
         grid of in-plane phase shifts $\\exp{(- 2 \\pi i (t_x q_x + t_y q_y))}$.
         """
-        xy = self.offset_in_angstroms[0:2]
-        return jnp.exp(-1.0j * (2 * jnp.pi * jnp.matmul(frequency_grid_in_angstroms, xy)))
+        # ... compute the dot product elementwise from the scalar offsets, rather
+        # than stacking them into a vector for a matrix-vector product. the phase
+        # is real, so build the shifts from its cosine and sine. the precision
+        # follows the frequency grid, so that the offsets do not promote it
+        qx, qy = frequency_grid_in_angstroms[..., 0], frequency_grid_in_angstroms[..., 1]
+        tx, ty = (
+            jnp.asarray(self.offset_x_in_angstroms, dtype=qx.dtype),
+            jnp.asarray(self.offset_y_in_angstroms, dtype=qy.dtype),
+        )
+        phase = (-2 * jnp.pi) * (qx * tx + qy * ty)
+        return jax.lax.complex(jnp.cos(phase), jnp.sin(phase))
 
     @cached_property
     def offset_in_angstroms(self) -> Float[Array, "2"]:
@@ -189,13 +223,22 @@ class EulerAnglePose(AbstractPose, strict=True):
         phi = jnp.deg2rad(phi)
         theta = jnp.deg2rad(theta)
         psi = jnp.deg2rad(psi)
-        # Get sequence of rotations.
-        R1, R2, R3 = (
-            SO3.from_z_radians(phi),
-            SO3.from_y_radians(theta),
-            SO3.from_z_radians(psi),
+        # Compute the quaternion for the sequence of rotations
+        # `SO3.from_z_radians(psi) @ SO3.from_y_radians(theta) @ SO3.from_z_radians(phi)`
+        # in closed form, rather than composing three exponential maps
+        half_theta = 0.5 * theta
+        half_sum, half_difference = 0.5 * (psi + phi), 0.5 * (psi - phi)
+        cos_half_theta, sin_half_theta = jnp.cos(half_theta), jnp.sin(half_theta)
+        return SO3(
+            wxyz=jnp.stack(
+                [
+                    cos_half_theta * jnp.cos(half_sum),
+                    -sin_half_theta * jnp.sin(half_difference),
+                    -sin_half_theta * jnp.cos(half_difference),
+                    -cos_half_theta * jnp.sin(half_sum),
+                ]
+            )
         )
-        return R3 @ R2 @ R1
 
     @override
     @classmethod
@@ -304,3 +347,99 @@ class AxisAnglePose(AbstractPose, strict=True):
         # Compute the euler vector from the logarithmic map
         euler_vector = jnp.rad2deg(rotation.log())
         return cls(euler_vector=euler_vector)
+
+
+def _check_coordinates(
+    coordinate_grid_or_list: Float[Array, "z_dim y_dim x_dim 3"] | Float[Array, "size 3"],
+):
+    if not isinstance(
+        coordinate_grid_or_list,
+        Float[Array, "size 3"] | Float[Array, "z_dim y_dim x_dim 3"],  # type: ignore
+    ):
+        raise ValueError(
+            "Coordinates must be a JAX array either of shape (N, 3) or "
+            f"(N1, N2, N3, 3). Instead, got {coordinate_grid_or_list.shape} and type "
+            f"{type(coordinate_grid_or_list)}."
+        )
+
+
+@eqx.filter_jit
+def _rotate_coordinates(
+    pose: AbstractPose,
+    coordinate_grid_or_list: Float[Array, "z_dim y_dim x_dim 3"] | Float[Array, "size 3"],
+    inverse: bool,
+    is_batched: bool,
+) -> Float[Array, "*batch z_dim y_dim x_dim 3"] | Float[Array, "*batch size 3"]:
+    # ... materialize the rotation matrix once and rotate all coordinates as an
+    # explicit matrix-vector product over the x, y, and z components, rather
+    # than mapping the quaternion rotation over each coordinate. this streams
+    # each component plane separately, which is faster than a contraction over
+    # the short trailing axis. the inverse rotation is the transpose, and
+    # `inverse` is static, so each direction is compiled once
+    x, y, z = (coordinate_grid_or_list[..., i] for i in range(3))
+    if is_batched:
+        rotation_matrix = _compute_batched_rotation_matrix(pose)
+        # ... broadcast each pose's matrix against the coordinates
+        batch_shape = rotation_matrix.shape[:-2]
+        rotation_matrix = rotation_matrix.reshape((*batch_shape, *(x.ndim * (1,)), 3, 3))
+    else:
+        rotation_matrix = pose.rotation.as_matrix()
+        if rotation_matrix.shape != (3, 3):
+            raise ValueError(
+                "Found a batched pose in `AbstractPose.rotate_coordinates`. "
+                "Use `AbstractPose.rotate_coordinates_batched` instead."
+            )
+    if inverse:
+        rotation_matrix = jnp.swapaxes(rotation_matrix, -1, -2)
+    return jnp.stack(
+        [
+            rotation_matrix[..., i, 0] * x
+            + rotation_matrix[..., i, 1] * y
+            + rotation_matrix[..., i, 2] * z
+            for i in range(3)
+        ],
+        axis=-1,
+    )
+
+
+def _compute_batched_rotation_matrix(pose: AbstractPose) -> Float[Array, "*batch 3 3"]:
+    # ... only the rotation parameters determine the batch shape of the
+    # rotation matrix, so the in-plane offsets are not considered
+    offset_names = ("offset_x_in_angstroms", "offset_y_in_angstroms")
+    names = tuple(
+        field.name for field in dataclasses.fields(pose) if field.name not in offset_names
+    )
+    # ... the batch dimensions of each rotation parameter are its leading
+    # dimensions beyond those of the same parameter for a single pose
+    unbatched_pose = jax.eval_shape(
+        lambda: type(pose).from_rotation(SO3(jnp.asarray((1.0, 0.0, 0.0, 0.0))))
+    )
+    batched_fields = {}
+    for name in names:
+        value = jnp.asarray(getattr(pose, name))
+        n_batch_dims = value.ndim - len(getattr(unbatched_pose, name).shape)
+        if n_batch_dims > 0:
+            batched_fields[name] = (value, n_batch_dims)
+    if len(batched_fields) == 0:
+        return pose.rotation.as_matrix()
+    batch_shape = jnp.broadcast_shapes(
+        *(value.shape[:n] for value, n in batched_fields.values())
+    )
+    # ... broadcast the batched parameters to a common, flattened batch
+    # dimension and compute the rotation matrix of each pose with `vmap`
+    names = tuple(batched_fields.keys())
+    flat_values = tuple(
+        jnp.broadcast_to(value, (*batch_shape, *value.shape[n:])).reshape(
+            (-1, *value.shape[n:])
+        )
+        for value, n in batched_fields.values()
+    )
+
+    def compute_rotation_matrix(values):
+        pose_at_index = eqx.tree_at(
+            lambda p: tuple(getattr(p, name) for name in names), pose, values
+        )
+        return pose_at_index.rotation.as_matrix()
+
+    rotation_matrix = jax.vmap(compute_rotation_matrix)(flat_values)
+    return rotation_matrix.reshape((*batch_shape, 3, 3))
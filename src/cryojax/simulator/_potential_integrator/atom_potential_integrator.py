@@ -1,12 +1,15 @@
-from typing import ClassVar, Optional
+from functools import partial
+from typing import Callable, ClassVar, Optional
 from typing_extensions import override
 
 import jax
 import jax.numpy as jnp
-from jaxtyping import Array, Complex, Float
+from jax.typing import DTypeLike
+from jaxtyping import Array, Complex, Float, Inexact
 
-from ...coordinates import make_1d_coordinate_grid
+from ...coordinates import make_1d_coordinate_grid, make_1d_frequency_grid
 from ...image import downsample_to_shape_with_fourier_cropping, rfftn
+from ...utils import batched_scan
 from .._instrument_config import InstrumentConfig
 from .._potential_representation import (
     GaussianMixtureAtomicPotential,
@@ -20,10 +23,20 @@ class GaussianMixtureProjection(
     strict=True,
 ):
     upsampling_factor: Optional[int]
+    evaluate_in_fourier_space: bool
+    intermediate_dtype: Optional[DTypeLike]
+    atom_groups_in_series: int
 
     is_projection_approximation: ClassVar[bool] = True
 
-    def __init__(self, *, upsampling_factor: Optional[int] = None):
+    def __init__(
+        self,
+        *,
+        upsampling_factor: Optional[int] = None,
+        evaluate_in_fourier_space: bool = False,
+        intermediate_dtype: Optional[DTypeLike] = None,
+        atom_groups_in_series: int = 1,
+    ):
         """**Arguments:**
 
         - `upsampling_factor`:
@@ -31,8 +44,28 @@ class GaussianMixtureProjection(
             If `upsampling_factor` is greater than 1, the images will be computed
             at a higher resolution and then downsampled to the original resolution.
             This can be useful for reducing aliasing artifacts in the images.
+        - `evaluate_in_fourier_space`:
+            If `True`, evaluate the analytic fourier transform of the projected
+            gaussians directly on the fourier-space grid, rather than evaluating
+            them in real space and computing an FFT. This does not suffer from
+            aliasing, so it cannot be used with an `upsampling_factor`.
+        - `intermediate_dtype`:
+            If passed, the data type in which to store the 1D gaussians
+            before they are contracted into the real-space projection, such
+            as `jnp.bfloat16`. The contraction is still accumulated in the
+            original precision. This cannot be used if
+            `evaluate_in_fourier_space = True`.
+        - `atom_groups_in_series`:
+            The number of iterations used to evaluate the projection,
+            where the iteration is taken over groups of atoms. The
+            projection of each group is accumulated into the same image,
+            so this is useful if memory is exhausted for large numbers of
+            atoms. By default, `1`.
         """  # noqa: E501
         self.upsampling_factor = upsampling_factor
+        self.evaluate_in_fourier_space = evaluate_in_fourier_space
+        self.intermediate_dtype = intermediate_dtype
+        self.atom_groups_in_series = atom_groups_in_series
 
     def __check_init__(self):
         if self.upsampling_factor is not None and self.upsampling_factor < 1:
@@ -40,6 +73,21 @@ class GaussianMixtureProjection(
                 "`GaussianMixtureProjection.upsampling_factor` must "
                 f"be greater than `1`. Got a value of {self.upsampling_factor}."
             )
+        if self.upsampling_factor is not None and self.evaluate_in_fourier_space:
+            raise AttributeError(
+                "`GaussianMixtureProjection.upsampling_factor` cannot be set "
+                "if `GaussianMixtureProjection.evaluate_in_fourier_space = True`."
+            )
+        if self.intermediate_dtype is not None and self.evaluate_in_fourier_space:
+            raise AttributeError(
+                "`GaussianMixtureProjection.intermediate_dtype` cannot be set "
+                "if `GaussianMixtureProjection.evaluate_in_fourier_space = True`."
+            )
+        if self.atom_groups_in_series < 1:
+            raise AttributeError(
+                "`GaussianMixtureProjection.atom_groups_in_series` must be "
+                f"greater than `1`. Got a value of {self.atom_groups_in_series}."
+            )
 
     @override
     def compute_fourier_integrated_potential(
@@ -62,19 +110,6 @@ class GaussianMixtureProjection(
         The Fourier transform of the integrated potential.
         """  # noqa: E501
 
-        if self.upsampling_factor is not None:
-            pixel_size = instrument_config.pixel_size / self.upsampling_factor
-            shape = (
-                instrument_config.padded_y_dim * self.upsampling_factor,
-                instrument_config.padded_x_dim * self.upsampling_factor,
-            )
-        else:
-            pixel_size = instrument_config.pixel_size
-            shape = instrument_config.padded_shape
-
-        grid_x = make_1d_coordinate_grid(shape[1], pixel_size)
-        grid_y = make_1d_coordinate_grid(shape[0], pixel_size)
-
         if isinstance(potential, PengAtomicPotential):
             if potential.b_factors is None:
                 gaussian_widths = potential.scattering_factor_b
@@ -95,8 +130,46 @@ class GaussianMixtureProjection(
                 " `GaussianMixtureAtomicPotential`."
             )
 
-        projection = _evaluate_2d_real_space_gaussian(
-            grid_x, grid_y, potential.atom_positions, gaussian_amplitudes, gaussian_widths
+        if self.evaluate_in_fourier_space:
+            pixel_size = instrument_config.pixel_size
+            shape = instrument_config.padded_shape
+            frequency_grid_x = make_1d_frequency_grid(
+                shape[1], pixel_size, get_rfftfreqs=True
+            )
+            frequency_grid_y = make_1d_frequency_grid(
+                shape[0], pixel_size, get_rfftfreqs=False
+            )
+            return _sum_over_atom_groups(
+                lambda xs: _evaluate_2d_fourier_space_gaussian(
+                    frequency_grid_x, frequency_grid_y, pixel_size, *xs
+                ),
+                (frequency_grid_y.size, frequency_grid_x.size),
+                jnp.result_type(gaussian_amplitudes, gaussian_widths, jnp.complex64),
+                (potential.atom_positions, gaussian_amplitudes, gaussian_widths),
+                self.atom_groups_in_series,
+            )
+
+        if self.upsampling_factor is not None:
+            pixel_size = instrument_config.pixel_size / self.upsampling_factor
+            shape = (
+                instrument_config.padded_y_dim * self.upsampling_factor,
+                instrument_config.padded_x_dim * self.upsampling_factor,
+            )
+        else:
+            pixel_size = instrument_config.pixel_size
+            shape = instrument_config.padded_shape
+
+        grid_x = make_1d_coordinate_grid(shape[1], pixel_size)
+        grid_y = make_1d_coordinate_grid(shape[0], pixel_size)
+
+        projection = _sum_over_atom_groups(
+            lambda xs: _evaluate_2d_real_space_gaussian(
+                grid_x, grid_y, *xs, self.intermediate_dtype
+            ),
+            shape,
+            jnp.result_type(grid_x, gaussian_amplitudes, gaussian_widths),
+            (potential.atom_positions, gaussian_amplitudes, gaussian_widths),
+            self.atom_groups_in_series,
         )
 
         if self.upsampling_factor is not None:
@@ -111,49 +184,149 @@ class GaussianMixtureProjection(
         return fourier_projection
 
 
-@jax.jit
+def _sum_over_atom_groups(
+    evaluate_projection: Callable[
+        [
+            tuple[
+                Float[Array, "n_atoms 3"],
+                Float[Array, "n_atoms n_gaussians_per_atom"],
+                Float[Array, "n_atoms n_gaussians_per_atom"],
+            ]
+        ],
+        Inexact[Array, "y_dim x_dim"],
+    ],
+    shape: tuple[int, int],
+    dtype: DTypeLike,
+    xs: tuple[
+        Float[Array, "n_atoms 3"],
+        Float[Array, "n_atoms n_gaussians_per_atom"],
+        Float[Array, "n_atoms n_gaussians_per_atom"],
+    ],
+    atom_groups_in_series: int,
+) -> Inexact[Array, "y_dim x_dim"]:
+    n_atoms = xs[0].shape[0]
+    if atom_groups_in_series > n_atoms:
+        raise ValueError(
+            "The `atom_groups_in_series` when computing a projection must "
+            "be an integer less than or equal to the number of atoms, "
+            f"which is equal to {n_atoms}."
+        )
+    if atom_groups_in_series == 1:
+        return evaluate_projection(xs)
+    # ... accumulate the projection for each group of atoms into the same
+    # image, rather than stacking the images of all groups and then summing
+    projection, _ = batched_scan(
+        lambda projection, xs: (projection + evaluate_projection(xs), None),
+        jnp.zeros(shape, dtype=dtype),
+        xs,
+        batch_size=n_atoms // atom_groups_in_series,
+    )
+    return projection
+
+
+@partial(jax.jit, static_argnums=(5,))
 def _evaluate_2d_real_space_gaussian(
     grid_x: Float[Array, " x_dim"],
     grid_y: Float[Array, " y_dim"],
     atom_positions: Float[Array, "n_atoms 3"],
     a: Float[Array, "n_atoms n_gaussians_per_atom"],
     b: Float[Array, "n_atoms n_gaussians_per_atom"],
+    intermediate_dtype: Optional[DTypeLike] = None,
 ) -> Float[Array, "y_dim x_dim"]:
-    """Evaluate a gaussian on a 3D grid.
+    """Evaluate the projection of a sum of gaussians on a 2D grid.
 
     **Arguments:**
 
     - `grid_x`: The x-coordinates of the grid.
     - `grid_y`: The y-coordinates of the grid.
-    - `pos`: The center of the gaussian.
+    - `atom_positions`: The centers of the gaussians, with shape `(n_atoms, 3)`.
     - `a`: A scale factor.
     - `b`: The scale of the gaussian.
+    - `intermediate_dtype`: If passed, the data type in which to store the
+                            1D gaussians before they are contracted.
 
     **Returns:**
 
     The potential of the gaussian on the grid.
     """
 
+    # Compute the per-gaussian constants once, rather than at each grid point
     b_inverse = 4.0 * jnp.pi / b
+    scaling = (-jnp.pi * b_inverse).T
+    prefactor = (4.0 * jnp.pi * a * b_inverse).T
+    # Evaluate the gaussians in the layout used by the contraction over atoms,
+    # so that no transposes are needed
+    gauss_x = prefactor[:, :, None] * jnp.exp(
+        scaling[:, :, None] * ((grid_x[None, :] - atom_positions[:, 0, None]) ** 2)
+    )
+    gauss_y = jnp.exp(
+        scaling[None, :, :] * ((grid_y[:, None] - atom_positions[:, 1]) ** 2)[:, None, :]
+    )
+    # Optionally store the gaussians in a lower precision, but accumulate
+    # the projection in the original precision
+    accumulation_dtype = gauss_x.dtype
+    if intermediate_dtype is not None:
+        gauss_x, gauss_y = (
+            gauss_x.astype(intermediate_dtype),
+            gauss_y.astype(intermediate_dtype),
+        )
+    # Contract over the gaussians per atom and the atoms in a single matmul
+    image = jnp.matmul(
+        gauss_y.reshape(grid_y.size, -1),
+        gauss_x.reshape(-1, grid_x.size),
+        preferred_element_type=accumulation_dtype,
+    )
 
+    return image
+
+
+@jax.jit
+def _evaluate_2d_fourier_space_gaussian(
+    frequency_grid_x: Float[Array, " x_dim"],
+    frequency_grid_y: Float[Array, " y_dim"],
+    pixel_size: Float[Array, ""],
+    atom_positions: Float[Array, "n_atoms 3"],
+    a: Float[Array, "n_atoms n_gaussians_per_atom"],
+    b: Float[Array, "n_atoms n_gaussians_per_atom"],
+) -> Complex[Array, "y_dim x_dim"]:
+    """Evaluate the fourier transform of a projected gaussian on a 2D grid.
+
+    **Arguments:**
+
+    - `frequency_grid_x`: The x-coordinates of the frequency grid.
+    - `frequency_grid_y`: The y-coordinates of the frequency grid.
+    - `pixel_size`: The pixel size of the image.
+    - `atom_positions`: The centers of the gaussians, with shape `(n_atoms, 3)`.
+    - `a`: A scale factor.
+    - `b`: The scale of the gaussian.
+
+    **Returns:**
+
+    The fourier transform of the projected potential of the gaussian on the
+    grid, normalized in the same way as an FFT of the real-space projection.
+    """
+
+    # The phase shifts only depend on the atom, so evaluate them once per atom
+    # rather than once per gaussian
     gauss_x = (
-        jnp.exp(
-            -jnp.pi
-            * b_inverse[None, :, :]
-            * ((grid_x[:, None] - atom_positions.T[0, :]) ** 2)[:, :, None]
-        )
+        jnp.exp(-b[None, :, :] * (frequency_grid_x**2)[:, None, None] / 4)
         * a[None, :, :]
-        * b_inverse[None, :, :]
+        * jnp.exp(-2j * jnp.pi * jnp.outer(frequency_grid_x, atom_positions.T[0, :]))[
+            :, :, None
+        ]
     )
-    gauss_y = jnp.exp(
-        -jnp.pi
-        * b_inverse[None, :, :]
-        * ((grid_y[:, None] - atom_positions.T[1, :]) ** 2)[:, :, None]
+    gauss_y = (
+        jnp.exp(-b[None, :, :] * (frequency_grid_y**2)[:, None, None] / 4)
+        * jnp.exp(-2j * jnp.pi * jnp.outer(frequency_grid_y, atom_positions.T[1, :]))[
+            :, :, None
+        ]
     )
 
     gauss_x = jnp.transpose(gauss_x, (2, 1, 0))
     gauss_y = jnp.transpose(gauss_y, (2, 0, 1))
 
-    image = 4 * jnp.pi * jnp.sum(jnp.matmul(gauss_y, gauss_x), axis=0)
+    fourier_image = (
+        4 * jnp.pi * jnp.sum(jnp.matmul(gauss_y, gauss_x), axis=0) / pixel_size**2
+    )
 
-    return image
+    return fourier_image
@@ -5,6 +5,7 @@ Methods for integrating the scattering potential directly onto the exit plane.
 from abc import abstractmethod
 from typing import Generic, Optional, TypeVar
 
+import jax
 import jax.numpy as jnp
 from equinox import AbstractClassVar, AbstractVar, error_if, Module
 from jaxtyping import Array, Complex
@@ -60,15 +61,27 @@ class AbstractVoxelPotentialIntegrator(
         `instrument_config.pixel_size` and the `instrument_config.padded_shape.`
         """
         if self.pixel_rescaling_method is None:
-            fourier_integrated_potential = error_if(
-                potential.voxel_size * fourier_integrated_potential_without_postprocess,
-                ~jnp.isclose(potential.voxel_size, instrument_config.pixel_size),
+            fourier_integrated_potential = (
+                potential.voxel_size * fourier_integrated_potential_without_postprocess
+            )
+            is_pixel_size_close = jnp.isclose(
+                potential.voxel_size, instrument_config.pixel_size
+            )
+            error_message = (
                 f"Tried to use {type(self).__name__} with `{type(potential).__name__}."
                 "voxel_size != InstrumentConfig.pixel_size`. If this is true, then "
                 f"`{type(self).__name__}.pixel_rescaling_method` must not be set to "
                 f"`None`. Try setting `{type(self).__name__}.pixel_rescaling_method = "
-                "'bicubic'`.",
+                "'bicubic'`."
             )
+            if isinstance(is_pixel_size_close, jax.core.Tracer):
+                # ... if the pixel sizes are traced, check at runtime
+                fourier_integrated_potential = error_if(
+                    fourier_integrated_potential, ~is_pixel_size_close, error_message
+                )
+            elif not is_pixel_size_close:
+                # ... otherwise, check at trace time
+                raise ValueError(error_message)
             return fourier_integrated_potential
         else:
             fourier_integrated_potential = maybe_rescale_pixel_size(
@@ -78,5 +91,6 @@ class AbstractVoxelPotentialIntegrator(
                 is_real=False,
                 is_hermitian_symmetric=is_hermitian_symmetric,
                 shape_in_real_space=instrument_config.padded_shape,
+                method=self.pixel_rescaling_method,
             )
             return fourier_integrated_potential
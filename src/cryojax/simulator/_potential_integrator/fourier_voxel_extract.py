@@ -51,6 +51,8 @@ class FourierSliceExtraction(AbstractVoxelPotentialIntegrator, strict=True):
         - `pixel_rescaling_method`:
             Method for rescaling the final image to the `InstrumentConfig`
             pixel size. See `cryojax.image.rescale_pixel_size` for documentation.
+            If `'fourier'`, rescale directly in fourier space with
+            `cryojax.image.rescale_pixel_size_in_fourier_space`.
         - `interpolation_order`:
             The interpolation order. This can be `0` (nearest-neighbor), `1`
             (linear), or `3` (cubic).
@@ -224,6 +226,8 @@ class EwaldSphereExtraction(AbstractVoxelPotentialIntegrator, strict=True):
         - `pixel_rescaling_method`:
             Method for rescaling the final image to the `InstrumentConfig`
             pixel size. See `cryojax.image.rescale_pixel_size` for documentation.
+            If `'fourier'`, rescale directly in fourier space with
+            `cryojax.image.rescale_pixel_size_in_fourier_space`.
         - `interpolation_order`:
             The interpolation order. This can be `0` (nearest-neighbor), `1`
             (linear), or `3` (cubic).
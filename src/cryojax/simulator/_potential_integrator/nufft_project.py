@@ -33,6 +33,7 @@ class NufftProjection(
         - `pixel_rescaling_method`: Method for interpolating the final image to
                                     the `InstrumentConfig` pixel size. See
                                     `cryojax.image.rescale_pixel_size` for documentation.
+                                    If `'fourier'`, rescale directly in fourier space.
         - `eps`: See [`jax-finufft`](https://github.com/flatironinstitute/jax-finufft)
                  for documentation.
         """
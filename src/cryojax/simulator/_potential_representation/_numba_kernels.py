@@ -0,0 +1,97 @@
+"""
+Numba kernels for building voxel grids from atoms on the host. This module
+imports `numba` at the top level, so it should only be imported lazily.
+"""
+
+import math
+
+import numba
+import numpy as np
+
+
+@numba.njit(fastmath=True)
+def _get_box_start_index(position, voxel_size, dim, box_size):
+    # Same convention as `_evaluate_gaussian_integrals_in_atom_boxes`
+    atom_index = int(round(position / voxel_size)) + dim // 2
+    return min(max(atom_index - box_size // 2, 0), dim - box_size)
+
+
+@numba.njit(fastmath=True)
+def _evaluate_gaussian_integrals_in_box(
+    gaussian_integrals, edge_grid, position, scaling, start_index, amplitude
+):
+    erf_at_left_edge = math.erf(scaling * (edge_grid[start_index] - position))
+    for i in range(gaussian_integrals.size):
+        erf_at_right_edge = math.erf(
+            scaling * (edge_grid[start_index + i + 1] - position)
+        )
+        gaussian_integrals[i] = amplitude * (erf_at_right_edge - erf_at_left_edge)
+        erf_at_left_edge = erf_at_right_edge
+
+
+@numba.njit(parallel=True, fastmath=True)
+def evaluate_voxel_potential_kernel(
+    edge_grid_x,
+    edge_grid_y,
+    edge_grid_z,
+    voxel_size,
+    atom_positions,
+    prefactor,
+    scaling,
+    box_size_x,
+    box_size_y,
+    box_size_z,
+    n_threads,
+):
+    n_atoms, n_gaussians_per_atom = prefactor.shape
+    dim_x, dim_y, dim_z = (
+        edge_grid_x.size - 1,
+        edge_grid_y.size - 1,
+        edge_grid_z.size - 1,
+    )
+    voxel_grid = np.zeros((dim_z, dim_y, dim_x))
+    # Partition the grid into disjoint slabs along z. Each thread owns its
+    # slab and accumulates every atom whose box overlaps it, so there are no
+    # races between threads and no per-thread copies of the grid
+    slab_height = (dim_z + n_threads - 1) // n_threads
+    n_slabs = (dim_z + slab_height - 1) // slab_height
+    for slab_index in numba.prange(n_slabs):
+        slab_start = slab_index * slab_height
+        slab_stop = min(slab_start + slab_height, dim_z)
+        gauss_x = np.empty(box_size_x)
+        gauss_y = np.empty(box_size_y)
+        gauss_z = np.empty(box_size_z)
+        for atom_index in range(n_atoms):
+            x, y, z = atom_positions[atom_index]
+            start_z = _get_box_start_index(z, voxel_size, dim_z, box_size_z)
+            k_start = max(start_z, slab_start)
+            k_stop = min(start_z + box_size_z, slab_stop)
+            if k_start >= k_stop:
+                continue
+            start_x = _get_box_start_index(x, voxel_size, dim_x, box_size_x)
+            start_y = _get_box_start_index(y, voxel_size, dim_y, box_size_y)
+            for gaussian_index in range(n_gaussians_per_atom):
+                s = scaling[atom_index, gaussian_index]
+                _evaluate_gaussian_integrals_in_box(
+                    gauss_x,
+                    edge_grid_x,
+                    x,
+                    s,
+                    start_x,
+                    prefactor[atom_index, gaussian_index],
+                )
+                _evaluate_gaussian_integrals_in_box(
+                    gauss_y, edge_grid_y, y, s, start_y, 1.0
+                )
+                _evaluate_gaussian_integrals_in_box(
+                    gauss_z, edge_grid_z, z, s, start_z, 1.0
+                )
+                for k in range(k_start, k_stop):
+                    gauss_z_at_k = gauss_z[k - start_z]
+                    for j in range(box_size_y):
+                        gauss_yz = gauss_y[j] * gauss_z_at_k
+                        for i in range(box_size_x):
+                            voxel_grid[k, start_y + j, start_x + i] += (
+                                gauss_yz * gauss_x[i]
+                            )
+    return voxel_grid
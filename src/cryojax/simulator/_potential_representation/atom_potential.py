@@ -2,24 +2,24 @@
 Atomistic representation of the scattering potential.
 """
 
+import functools
+import math
 from abc import abstractmethod
-from typing import Callable, Optional
+from typing import Any, Callable, Literal, Optional
 from typing_extensions import override, Self
 
 import equinox as eqx
 import jax
 import jax.numpy as jnp
 import jax.scipy as jsp
-import jax.tree_util as jtu
 import numpy as np
-from jaxtyping import Array, Float, Int, PyTree
+from jax.typing import DTypeLike
+from jaxtyping import Array, Complex, Float, Inexact, Int
 
-from ...constants import (
-    get_tabulated_scattering_factor_parameters,
-    read_peng_element_scattering_factor_parameter_table,
-)
-from ...coordinates import make_1d_coordinate_grid
+from ...constants import get_tabulated_scattering_factor_parameters
+from ...coordinates import make_1d_coordinate_grid, make_1d_frequency_grid
 from ...internal import error_if_negative, error_if_not_positive
+from ...utils import batched_map, batched_scan
 from .._pose import AbstractPose
 from .base_potential import AbstractPotentialRepresentation
 
@@ -72,6 +72,8 @@ class AbstractAtomicPotential(AbstractPotentialRepresentation, strict=True):
 
     def rotate_to_pose(self, pose: AbstractPose) -> Self:
         """Return a new potential with rotated `atom_positions`."""
+        # Replace the positions directly, rather than calling the constructor,
+        # so that the other fields are not validated or looked up again
         return eqx.tree_at(
             lambda d: d.atom_positions,
             self,
@@ -86,6 +88,38 @@ class AbstractAtomicPotential(AbstractPotentialRepresentation, strict=True):
     ) -> Float[Array, "{shape[0]} {shape[1]} {shape[2]}"]:
         raise NotImplementedError
 
+    def as_real_voxel_grid_batched(
+        self,
+        poses: AbstractPose,
+        shape: tuple[int, int, int],
+        voxel_size: Float[Array, ""] | float,
+        **kwargs: Any,
+    ) -> Float[Array, "n_poses {shape[0]} {shape[1]} {shape[2]}"]:
+        """Return a batch of voxel grids of the potential in real space,
+        one for each pose in a batch of poses.
+
+        The atoms are rotated to each pose and evaluated on the voxel grid
+        with `jax.vmap`, so the whole batch is computed in a single compiled
+        function.
+
+        **Arguments:**
+
+        - `poses`:
+            An `AbstractPose` whose parameters have a leading batch
+            dimension, for example created with `equinox.filter_vmap`.
+        - `shape`: The shape of each voxel grid.
+        - `voxel_size`: The voxel size of each voxel grid.
+        - `kwargs`:
+            Keyword arguments passed to `as_real_voxel_grid`.
+
+        **Returns:**
+
+        The voxel grids, stacked along a leading batch dimension.
+        """
+        return _build_real_space_voxel_potentials_at_poses(
+            self, poses, shape, jnp.asarray(voxel_size), kwargs
+        )
+
 
 class GaussianMixtureAtomicPotential(AbstractAtomicPotential, strict=True):
     """An atomistic representation of scattering potential as a mixture of
@@ -148,7 +182,7 @@ class GaussianMixtureAtomicPotential(AbstractAtomicPotential, strict=True):
         """
         self.atom_positions = jnp.asarray(atom_positions)
         self.gaussian_amplitudes = jnp.asarray(gaussian_amplitudes)
-        self.gaussian_widths = error_if_not_positive(jnp.asarray(gaussian_widths))
+        self.gaussian_widths = error_if_not_positive(gaussian_widths)
 
     @override
     def as_real_voxel_grid(
@@ -158,6 +192,10 @@ class GaussianMixtureAtomicPotential(AbstractAtomicPotential, strict=True):
         *,
         z_planes_in_parallel: int = 1,
         atom_groups_in_series: int = 1,
+        atom_box_size: Optional[int | Literal["auto"]] = None,
+        intermediate_dtype: Optional[DTypeLike] = None,
+        atoms_per_z_batch: Optional[int] = None,
+        use_numba: bool = False,
     ) -> Float[Array, "{shape[0]} {shape[1]} {shape[2]}"]:
         """Return a voxel grid of the potential in real space.
 
@@ -169,13 +207,49 @@ class GaussianMixtureAtomicPotential(AbstractAtomicPotential, strict=True):
         - `shape`: The shape of the resulting voxel grid.
         - `voxel_size`: The voxel size of the resulting voxel grid.
         - `z_planes_in_parallel`:
-            The number of z-planes to evaluate in parallel with
-            `jax.vmap`. By default, `1`.
+            The number of z-planes to evaluate in parallel as a
+            single tensor contraction. By default, `1`.
         - `atom_groups_in_series`:
             The number of iterations used to evaluate the volume,
             where the iteration is taken over groups of atoms.
             This is useful if `z_planes_in_parallel = 1`
-            and GPU memory is exhausted. By default, `1`.
+            and GPU memory is exhausted. When differentiating, each
+            group is recomputed on the backward pass, so that memory
+            does not grow with the number of groups. By default, `1`.
+        - `atom_box_size`:
+            If passed, only evaluate each atom inside of a cubic box
+            of `atom_box_size` voxels per side centered on the atom,
+            rather than on the full voxel grid. This is much faster for
+            large grids, but the box must be large enough to contain the
+            gaussians of each atom. If `"auto"`, choose the smallest box
+            that contains the gaussians of every atom, up to where their
+            integrals saturate. This requires that the gaussian widths are
+            not traced, for example under `jax.jit`. If `None`, evaluate
+            each atom on the full voxel grid. By default, `None`.
+        - `intermediate_dtype`:
+            If passed, the data type in which to store the 1D gaussian
+            integrals before they are contracted into the voxel grid, such
+            as `jnp.bfloat16`. The contraction is still accumulated in the
+            data type of the voxel grid. This trades precision for memory
+            bandwidth. By default, `None`, in which case the integrals are
+            not cast.
+        - `atoms_per_z_batch`:
+            If passed, sort the atoms by their z-coordinate and, for each
+            batch of `z_planes_in_parallel` z-planes, only contract over the
+            `atoms_per_z_batch` atoms nearest to the batch. This is much
+            faster for flat specimens, but it must be at least the number of
+            atoms whose gaussians overlap with any batch of z-planes, and
+            otherwise an error is raised at runtime. This is ignored if
+            `atom_box_size` is passed. If `None`, contract over all atoms at
+            each z-plane. By default, `None`.
+        - `use_numba`:
+            If `True` and the default JAX backend is the CPU, evaluate
+            the voxel grid with a multi-threaded `numba` kernel through
+            `jax.pure_callback`, rather than with JAX. This can be much
+            faster on the CPU, but it is not differentiable and requires
+            `numba` to be installed (e.g. with `pip install cryojax[numba]`).
+            The `atom_box_size` is respected, and
+            the other options are ignored. By default, `False`.
 
         **Returns:**
 
@@ -190,6 +264,42 @@ class GaussianMixtureAtomicPotential(AbstractAtomicPotential, strict=True):
             self.gaussian_widths,
             z_planes_in_parallel=z_planes_in_parallel,
             atom_groups_in_series=atom_groups_in_series,
+            atom_box_size=_resolve_atom_box_size(
+                atom_box_size, self.gaussian_widths, voxel_size, shape
+            ),
+            intermediate_dtype=intermediate_dtype,
+            atoms_per_z_batch=atoms_per_z_batch,
+            use_numba=use_numba,
+        )
+
+    def as_fourier_voxel_grid(
+        self,
+        shape: tuple[int, int, int],
+        voxel_size: Float[Array, ""] | float,
+    ) -> Complex[Array, "{shape[0]} {shape[1]} {shape[2]}"]:
+        """Return a voxel grid of the potential in fourier space.
+
+        See [`PengAtomicPotential.as_fourier_voxel_grid`](scattering_potential.md#cryojax.simulator.PengAtomicPotential.as_fourier_voxel_grid)
+        for the numerical conventions used when computing the fourier transform
+        of the sum of gaussians. A real-space voxel grid with periodic boundaries
+        can be computed from this with `cryojax.image.ifftn(...).real`.
+
+        **Arguments:**
+
+        - `shape`: The shape of the resulting voxel grid.
+        - `voxel_size`: The voxel size of the resulting voxel grid.
+
+        **Returns:**
+
+        The fourier transform of the rescaled potential $U_{\\ell}$ as a voxel grid
+        of shape `shape`, with the zero frequency component in the corner.
+        """  # noqa: E501
+        return _build_fourier_space_voxel_potential_from_atoms(
+            shape,
+            jnp.asarray(voxel_size),
+            self.atom_positions,
+            self.gaussian_amplitudes,
+            self.gaussian_widths,
         )
 
 
@@ -267,10 +377,6 @@ class PengAtomicPotential(AbstractTabulatedAtomicPotential, strict=True):
             not provided, load from `cryojax.constants`.
 
         """
-        if scattering_factor_parameter_table is None:
-            scattering_factor_parameter_table = (
-                read_peng_element_scattering_factor_parameter_table()
-            )
         self.atom_positions = jnp.asarray(atom_positions)
         scattering_factor_a, scattering_factor_b = (
             get_tabulated_scattering_factor_parameters(
@@ -282,7 +388,7 @@ class PengAtomicPotential(AbstractTabulatedAtomicPotential, strict=True):
         if b_factors is None:
             self.b_factors = None
         else:
-            self.b_factors = error_if_negative(jnp.asarray(b_factors))
+            self.b_factors = error_if_negative(b_factors)
 
     @override
     def as_real_voxel_grid(
@@ -292,6 +398,10 @@ class PengAtomicPotential(AbstractTabulatedAtomicPotential, strict=True):
         *,
         z_planes_in_parallel: int = 1,
         atom_groups_in_series: int = 1,
+        atom_box_size: Optional[int | Literal["auto"]] = None,
+        intermediate_dtype: Optional[DTypeLike] = None,
+        atoms_per_z_batch: Optional[int] = None,
+        use_numba: bool = False,
     ) -> Float[Array, "{shape[0]} {shape[1]} {shape[2]}"]:
         """Return a voxel grid of the potential in real space.
 
@@ -334,13 +444,49 @@ class PengAtomicPotential(AbstractTabulatedAtomicPotential, strict=True):
         - `shape`: The shape of the resulting voxel grid.
         - `voxel_size`: The voxel size of the resulting voxel grid.
         - `z_planes_in_parallel`:
-            The number of z-planes to evaluate in parallel with
-            `jax.vmap`. By default, `1`.
+            The number of z-planes to evaluate in parallel as a
+            single tensor contraction. By default, `1`.
         - `atom_groups_in_series`:
             The number of iterations used to evaluate the volume,
             where the iteration is taken over groups of atoms.
             This is useful if `z_planes_in_parallel = 1`
-            and GPU memory is exhausted. By default, `1`.
+            and GPU memory is exhausted. When differentiating, each
+            group is recomputed on the backward pass, so that memory
+            does not grow with the number of groups. By default, `1`.
+        - `atom_box_size`:
+            If passed, only evaluate each atom inside of a cubic box
+            of `atom_box_size` voxels per side centered on the atom,
+            rather than on the full voxel grid. This is much faster for
+            large grids, but the box must be large enough to contain the
+            gaussians of each atom. If `"auto"`, choose the smallest box
+            that contains the gaussians of every atom, up to where their
+            integrals saturate. This requires that the gaussian widths are
+            not traced, for example under `jax.jit`. If `None`, evaluate
+            each atom on the full voxel grid. By default, `None`.
+        - `intermediate_dtype`:
+            If passed, the data type in which to store the 1D gaussian
+            integrals before they are contracted into the voxel grid, such
+            as `jnp.bfloat16`. The contraction is still accumulated in the
+            data type of the voxel grid. This trades precision for memory
+            bandwidth. By default, `None`, in which case the integrals are
+            not cast.
+        - `atoms_per_z_batch`:
+            If passed, sort the atoms by their z-coordinate and, for each
+            batch of `z_planes_in_parallel` z-planes, only contract over the
+            `atoms_per_z_batch` atoms nearest to the batch. This is much
+            faster for flat specimens, but it must be at least the number of
+            atoms whose gaussians overlap with any batch of z-planes, and
+            otherwise an error is raised at runtime. This is ignored if
+            `atom_box_size` is passed. If `None`, contract over all atoms at
+            each z-plane. By default, `None`.
+        - `use_numba`:
+            If `True` and the default JAX backend is the CPU, evaluate
+            the voxel grid with a multi-threaded `numba` kernel through
+            `jax.pure_callback`, rather than with JAX. This can be much
+            faster on the CPU, but it is not differentiable and requires
+            `numba` to be installed (e.g. with `pip install cryojax[numba]`).
+            The `atom_box_size` is respected, and
+            the other options are ignored. By default, `False`.
 
         **Returns:**
 
@@ -360,8 +506,137 @@ class PengAtomicPotential(AbstractTabulatedAtomicPotential, strict=True):
             gaussian_widths,
             z_planes_in_parallel=z_planes_in_parallel,
             atom_groups_in_series=atom_groups_in_series,
+            atom_box_size=_resolve_atom_box_size(
+                atom_box_size, gaussian_widths, voxel_size, shape
+            ),
+            intermediate_dtype=intermediate_dtype,
+            atoms_per_z_batch=atoms_per_z_batch,
+            use_numba=use_numba,
         )
 
+    def as_fourier_voxel_grid(
+        self,
+        shape: tuple[int, int, int],
+        voxel_size: Float[Array, ""] | float,
+    ) -> Complex[Array, "{shape[0]} {shape[1]} {shape[2]}"]:
+        """Return a voxel grid of the potential in fourier space.
+
+        This evaluates the analytic fourier transform $\\tilde{U}(\\boldsymbol{\\xi})$
+        (see [`PengAtomicPotential.as_real_voxel_grid`](scattering_potential.md#cryojax.simulator.PengAtomicPotential.as_real_voxel_grid))
+        on the discrete fourier transform frequencies of the voxel grid, including
+        the average over each voxel. This avoids evaluating error functions and
+        computing an FFT of the real-space voxel grid.
+
+        The result is returned in the conventions of `cryojax.image.fftn`, so it
+        agrees with `fftn(potential.as_real_voxel_grid(shape, voxel_size))` up to
+        aliasing of the real-space voxel grid.
+
+        **Arguments:**
+
+        - `shape`: The shape of the resulting voxel grid.
+        - `voxel_size`: The voxel size of the resulting voxel grid.
+
+        **Returns:**
+
+        The fourier transform of the rescaled potential $U_{\\ell}$ as a voxel grid
+        of shape `shape`, with the zero frequency component in the corner.
+        """  # noqa: E501
+        gaussian_amplitudes = self.scattering_factor_a
+        if self.b_factors is None:
+            gaussian_widths = self.scattering_factor_b
+        else:
+            gaussian_widths = self.scattering_factor_b + self.b_factors[:, None]
+        return _build_fourier_space_voxel_potential_from_atoms(
+            shape,
+            jnp.asarray(voxel_size),
+            self.atom_positions,
+            gaussian_amplitudes,
+            gaussian_widths,
+        )
+
+
+def _resolve_atom_box_size(
+    atom_box_size: Optional[int | Literal["auto"]],
+    gaussian_widths: Float[Array, "n_atoms n_gaussians_per_atom"],
+    voxel_size: Float[Array, ""] | float,
+    shape: tuple[int, int, int],
+) -> Optional[int]:
+    if atom_box_size != "auto":
+        return atom_box_size
+    # The integrals of a gaussian saturate at four times the inverse scaling
+    # of the error function arguments, sqrt(b) / (2 pi), from the atom
+    cutoff_in_voxels = (
+        4 * jnp.sqrt(jnp.max(gaussian_widths)) / (2 * jnp.pi * jnp.asarray(voxel_size))
+    )
+    if isinstance(cutoff_in_voxels, jax.core.Tracer):
+        raise ValueError(
+            "Tried to build a voxel grid from atoms with `atom_box_size = 'auto'`, "
+            "but the gaussian widths or the voxel size are traced, for example "
+            "under `jax.jit`. In this case, `atom_box_size` must be an integer."
+        )
+    # ... the box is centered on the nearest voxel to the atom, so pad by a voxel
+    # on each side
+    atom_box_size = 2 * math.ceil(float(cutoff_in_voxels) + 1) + 1
+    return min(atom_box_size, min(shape))
+
+
+@eqx.filter_jit
+def _build_real_space_voxel_potentials_at_poses(
+    potential: AbstractAtomicPotential,
+    poses: AbstractPose,
+    shape: tuple[int, int, int],
+    voxel_size: Float[Array, ""],
+    kwargs: dict[str, Any],
+) -> Float[Array, "n_poses {shape[0]} {shape[1]} {shape[2]}"]:
+    @eqx.filter_vmap
+    def build_voxel_grid_at_pose(pose):
+        return potential.rotate_to_pose(pose).as_real_voxel_grid(
+            shape, voxel_size, **kwargs
+        )
+
+    return build_voxel_grid_at_pose(poses)
+
+
+@eqx.filter_jit
+def _build_fourier_space_voxel_potential_from_atoms(
+    shape: tuple[int, int, int],
+    voxel_size: Float[Array, ""],
+    atom_positions: Float[Array, "n_atoms 3"],
+    a: Float[Array, "n_atoms n_gaussians_per_atom"],
+    b: Float[Array, "n_atoms n_gaussians_per_atom"],
+) -> Complex[Array, "{shape[0]} {shape[1]} {shape[2]}"]:
+    # Make frequency coordinate systems for each of x, y, and z dimensions
+    z_dim, y_dim, x_dim = shape
+    freqs_x, freqs_y, freqs_z = [
+        make_1d_frequency_grid(dim, voxel_size, get_rfftfreqs=False)
+        for dim in [x_dim, y_dim, z_dim]
+    ]
+    # Evaluate the fourier transform of the 1D gaussians averaged over a voxel,
+    # for each of x, y, and z dimensions. This is separable, as in real space
+    kernel = lambda freqs, positions: (
+        jnp.exp(-b.T[:, :, None] * freqs**2 / 4)
+        * jnp.exp(-2j * jnp.pi * positions[None, :, None] * freqs)
+        * jnp.sinc(freqs * voxel_size)
+    )
+    gauss_x, gauss_y, gauss_z = (
+        kernel(freqs_x, atom_positions[:, 0]),
+        kernel(freqs_y, atom_positions[:, 1]),
+        kernel(freqs_z, atom_positions[:, 2]),
+    )
+    # Multiply the prefactor onto one of the gaussians for efficiency
+    prefactor = (4 * jnp.pi * a.T) / voxel_size**3
+    # Compute the voxel grid at each z-plane in the same layout as in real space,
+    # carrying the x and y kernels through the scan as loop-invariants
+    _, potential_as_voxel_grid = jax.lax.scan(
+        lambda carry, gauss_z_at_plane: (
+            carry,
+            _evaluate_gaussian_potential_at_z_plane(*carry, gauss_z_at_plane),
+        ),
+        (prefactor[:, :, None] * gauss_x, jnp.transpose(gauss_y, (2, 0, 1))),
+        jnp.transpose(gauss_z, (2, 0, 1)),
+    )
+    return potential_as_voxel_grid
+
 
 @eqx.filter_jit
 def _build_real_space_voxel_potential_from_atoms(
@@ -372,47 +647,124 @@ def _build_real_space_voxel_potential_from_atoms(
     b: Float[Array, "n_atoms n_gaussians_per_atom"],
     z_planes_in_parallel: int,
     atom_groups_in_series: int,
+    atom_box_size: Optional[int] = None,
+    intermediate_dtype: Optional[DTypeLike] = None,
+    atoms_per_z_batch: Optional[int] = None,
+    use_numba: bool = False,
 ) -> Float[Array, "{shape[0]} {shape[1]} {shape[2]}"]:
-    # Make coordinate systems for each of x, y, and z dimensions
+    # Make coordinate systems for the voxel edges in each of x, y, and z
+    # dimensions. These do not depend on the atoms, so they are computed
+    # once rather than for each group of atoms
     z_dim, y_dim, x_dim = shape
-    grid_x, grid_y, grid_z = [
-        make_1d_coordinate_grid(dim, voxel_size) for dim in [x_dim, y_dim, z_dim]
+    edge_grid_x, edge_grid_y, edge_grid_z = [
+        _make_voxel_edge_grid(make_1d_coordinate_grid(dim, voxel_size), voxel_size)
+        for dim in [x_dim, y_dim, z_dim]
     ]
+    # Compute the prefactors of the potential and the scale of the error function
+    # arguments for each atom and each gaussian per atom. These are also
+    # computed once and then passed to the kernels for each group of atoms
+    prefactor = (4 * jnp.pi * a) / (2 * voxel_size) ** 3
+    scaling = 2 * jnp.pi / jnp.sqrt(b)
+    if atom_groups_in_series > atom_positions.shape[0]:
+        raise ValueError(
+            "The `atom_groups_in_series` when building a voxel grid must "
+            "be an integer less than or equal to the number of atoms, "
+            f"which is equal to {atom_positions.shape[0]}."
+        )
+    elif atom_groups_in_series < 1:
+        raise ValueError(
+            "The `atom_groups_in_series` when building a voxel grid must be an "
+            "integer greater than or equal to 1."
+        )
+    if atoms_per_z_batch is not None and atoms_per_z_batch < 1:
+        raise ValueError(
+            "The `atoms_per_z_batch` when building a voxel grid must be an "
+            "integer greater than or equal to 1."
+        )
+    if atom_box_size is not None:
+        # ... only evaluate each atom in a box of voxels surrounding it
+        if atom_box_size < 1 or atom_box_size > min(shape):
+            raise ValueError(
+                "The `atom_box_size` when building a voxel grid must be an "
+                "integer greater than or equal to 1 and less than or equal to "
+                "the smallest dimension of the grid, which is equal to "
+                f"{min(shape)}."
+            )
+    if use_numba and jax.default_backend() == "cpu":
+        # ... evaluate the voxel grid on the host with numba
+        return _build_real_space_voxel_potential_from_atoms_with_numba(
+            edge_grid_x,
+            edge_grid_y,
+            edge_grid_z,
+            voxel_size,
+            atom_positions,
+            prefactor,
+            scaling,
+            atom_box_size,
+        )
+    if atom_box_size is not None:
+        # Accumulate the boxes for each group of atoms into the same voxel grid,
+        # so that memory does not grow with the number of groups. When
+        # differentiating, the whole group, including the contraction into
+        # boxes, is recomputed on the backward pass rather than storing its
+        # intermediates for every group
+        add_atom_group_to_voxel_grid = jax.checkpoint(
+            lambda voxel_grid, xs: (
+                _add_atom_boxes_to_voxel_grid(
+                    voxel_grid,
+                    edge_grid_x,
+                    edge_grid_y,
+                    edge_grid_z,
+                    voxel_size,
+                    xs[0],
+                    xs[1],
+                    xs[2],
+                    atom_box_size,
+                    intermediate_dtype,
+                ),
+                None,
+            )
+        )
+        potential_as_voxel_grid, _ = batched_scan(
+            add_atom_group_to_voxel_grid,
+            jnp.zeros(shape, dtype=jnp.result_type(atom_positions, prefactor, scaling)),
+            (atom_positions, prefactor, scaling),
+            batch_size=atom_positions.shape[0] // atom_groups_in_series,
+        )
+        return potential_as_voxel_grid
     # Get function to compute potential over a batch of atoms
     compute_potential_for_atom_group = (
         lambda xs: _build_real_space_voxel_potential_from_atom_group(
-            grid_x,
-            grid_y,
-            grid_z,
-            voxel_size,
+            edge_grid_x,
+            edge_grid_y,
+            edge_grid_z,
             xs[0],
             xs[1],
             xs[2],
             z_planes_in_parallel,
+            intermediate_dtype,
+            atoms_per_z_batch,
         )
     )
-    if atom_groups_in_series > atom_positions.shape[0]:
-        raise ValueError(
-            "The `atom_groups_in_series` when building a voxel grid must "
-            "be an integer less than or equal to the number of atoms, "
-            f"which is equal to {atom_positions.shape[0]}."
-        )
-    elif atom_groups_in_series == 1:
-        potential_as_voxel_grid = compute_potential_for_atom_group((atom_positions, a, b))
-    elif atom_groups_in_series > 1:
-        potential_as_voxel_grid = jnp.sum(
-            _batched_map(
-                compute_potential_for_atom_group,
-                (atom_positions, a, b),
-                batch_size=atom_positions.shape[0] // atom_groups_in_series,
-                is_batch_axis_contracted=True,
-            ),
-            axis=0,
+    if atom_groups_in_series == 1:
+        potential_as_voxel_grid = compute_potential_for_atom_group(
+            (atom_positions, prefactor, scaling)
         )
     else:
-        raise ValueError(
-            "The `atom_groups_in_series` when building a voxel grid must be an "
-            "integer greater than or equal to 1."
+        # ... accumulate the voxel grid for each group of atoms into the same
+        # voxel grid, rather than stacking the voxel grids of all groups and
+        # then summing. When differentiating, the whole group, including the
+        # contraction over atoms, is recomputed on the backward pass, so that
+        # memory does not grow with the number of groups
+        add_atom_group_to_voxel_grid = lambda voxel_grid, xs: (
+            voxel_grid + jax.checkpoint(compute_potential_for_atom_group)(xs),
+            None,
+        )
+        potential_as_voxel_grid, _ = batched_scan(
+            add_atom_group_to_voxel_grid,
+            jnp.zeros(shape, dtype=jnp.result_type(atom_positions, prefactor, scaling)),
+            (atom_positions, prefactor, scaling),
+            batch_size=atom_positions.shape[0] // atom_groups_in_series,
         )
 
     return potential_as_voxel_grid
@@ -420,52 +772,109 @@ def _build_real_space_voxel_potential_from_atoms(
 
 @eqx.filter_jit
 def _build_real_space_voxel_potential_from_atom_group(
-    grid_x: Float[Array, " dim_x"],
-    grid_y: Float[Array, " dim_y"],
-    grid_z: Float[Array, " dim_z"],
-    voxel_size: Float[Array, ""],
+    edge_grid_x: Float[Array, " n_edges_x"],
+    edge_grid_y: Float[Array, " n_edges_y"],
+    edge_grid_z: Float[Array, " n_edges_z"],
     atom_positions: Float[Array, "n_atoms_in_batch 3"],
-    a: Float[Array, "n_atoms_in_batch n_gaussians_per_atom"],
-    b: Float[Array, "n_atoms_in_batch n_gaussians_per_atom"],
+    prefactor: Float[Array, "n_atoms_in_batch n_gaussians_per_atom"],
+    scaling: Float[Array, "n_atoms_in_batch n_gaussians_per_atom"],
     z_planes_in_parallel: int,
+    intermediate_dtype: Optional[DTypeLike] = None,
+    atoms_per_z_batch: Optional[int] = None,
 ) -> Float[Array, "dim_z dim_y dim_x"]:
+    if atoms_per_z_batch is not None:
+        # Sort the atoms by their z-coordinate, so that the atoms near a batch
+        # of z-planes are contiguous
+        sorted_indices = jnp.argsort(atom_positions[:, 2])
+        atom_positions, prefactor, scaling = (
+            atom_positions[sorted_indices],
+            prefactor[sorted_indices],
+            scaling[sorted_indices],
+        )
     # Evaluate 1D gaussian integrals for each of x, y, and z dimensions
     (
         gaussian_integrals_times_prefactor_per_interval_per_atom_x,
         gaussian_integrals_per_interval_per_atom_y,
         gaussian_integrals_per_interval_per_atom_z,
     ) = _evaluate_gaussian_integrals_for_all_atoms_and_intervals(
-        grid_x, grid_y, grid_z, atom_positions, a, b, voxel_size
+        edge_grid_x, edge_grid_y, edge_grid_z, atom_positions, prefactor, scaling
     )
-    # Get function to compute voxel grid at a single z-plane
-    compute_potential_at_z_plane = jax.jit(
-        lambda gaussian_integrals_per_atom_z: _evaluate_gaussian_potential_at_z_plane(
+    # Optionally store the integrals in a lower precision, but accumulate
+    # the potential in the original precision
+    accumulation_dtype = gaussian_integrals_per_interval_per_atom_z.dtype
+    if intermediate_dtype is not None:
+        (
             gaussian_integrals_times_prefactor_per_interval_per_atom_x,
             gaussian_integrals_per_interval_per_atom_y,
-            gaussian_integrals_per_atom_z,
+            gaussian_integrals_per_interval_per_atom_z,
+        ) = (
+            gaussian_integrals_times_prefactor_per_interval_per_atom_x.astype(
+                intermediate_dtype
+            ),
+            gaussian_integrals_per_interval_per_atom_y.astype(intermediate_dtype),
+            gaussian_integrals_per_interval_per_atom_z.astype(intermediate_dtype),
+        )
+    # Get function to compute voxel grid at a single z-plane or a batch of
+    # z-planes. This is already traced as part of the enclosing
+    # `eqx.filter_jit`, so it is not wrapped in another `jax.jit`
+    z_dim = edge_grid_z.size - 1
+    if z_planes_in_parallel == 1:
+        evaluate_potential = _evaluate_gaussian_potential_at_z_plane
+    else:
+        evaluate_potential = _evaluate_gaussian_potential_at_z_planes
+    if atoms_per_z_batch is None:
+        compute_potential = functools.partial(
+            evaluate_potential, accumulation_dtype=accumulation_dtype
+        )
+        xs = gaussian_integrals_per_interval_per_atom_z
+    else:
+        # ... only contract over the atoms near each batch of z-planes. Past
+        # four times the inverse scaling, the error functions are saturated
+        compute_potential = functools.partial(
+            _evaluate_gaussian_potential_for_atoms_near_z_planes,
+            functools.partial(evaluate_potential, accumulation_dtype=accumulation_dtype),
+            atom_positions[:, 2],
+            4 / jnp.min(scaling),
+            min(atoms_per_z_batch, atom_positions.shape[0]),
+        )
+        xs = (
+            gaussian_integrals_per_interval_per_atom_z,
+            edge_grid_z[:-1],
+            edge_grid_z[1:],
         )
-    )
     # Map over z-planes
-    if z_planes_in_parallel > grid_z.size:
+    if z_planes_in_parallel > z_dim:
         raise ValueError(
             "The `z_planes_in_parallel` when building a voxel grid must be an "
             "integer less than or equal to the z-dimension of the grid, "
-            f"which is equal to {grid_z.size}."
+            f"which is equal to {z_dim}."
         )
     elif z_planes_in_parallel == 1:
-        # ... compute the volume iteratively
-        potential_as_voxel_grid = jax.lax.map(
-            compute_potential_at_z_plane, gaussian_integrals_per_interval_per_atom_z
+        # ... compute the volume iteratively. The x and y integrals are the
+        # carry of the scan, so that they are loop-invariants
+        _, potential_as_voxel_grid = jax.lax.scan(
+            lambda carry, x: (carry, compute_potential(*carry, x)),
+            (
+                gaussian_integrals_times_prefactor_per_interval_per_atom_x,
+                gaussian_integrals_per_interval_per_atom_y,
+            ),
+            xs,
         )
     elif z_planes_in_parallel > 1:
-        # ... compute the volume by tuning how many z-planes to batch over
-        compute_potential_at_z_planes = jax.vmap(compute_potential_at_z_plane, in_axes=0)
-        potential_as_voxel_grid = _batched_map(
-            compute_potential_at_z_planes,
-            gaussian_integrals_per_interval_per_atom_z,
-            batch_size=z_planes_in_parallel,
-            is_batch_axis_contracted=False,
+        # ... compute the volume by tuning how many z-planes to batch over.
+        # A batch of z-planes is a single tensor contraction
+        compute_potential = functools.partial(
+            compute_potential,
+            gaussian_integrals_times_prefactor_per_interval_per_atom_x,
+            gaussian_integrals_per_interval_per_atom_y,
         )
+        if z_planes_in_parallel == z_dim:
+            # ... if all z-planes are computed in parallel, there is no loop
+            potential_as_voxel_grid = compute_potential(xs)
+        else:
+            potential_as_voxel_grid = batched_map(
+                compute_potential, xs, batch_size=z_planes_in_parallel
+            )
     else:
         raise ValueError(
             "The `z_planes_in_parallel` when building a voxel grid must be an "
@@ -475,110 +884,329 @@ def _build_real_space_voxel_potential_from_atom_group(
     return potential_as_voxel_grid
 
 
+def _evaluate_gaussian_potential_for_atoms_near_z_planes(
+    evaluate_potential: Callable,
+    sorted_atom_positions_z: Float[Array, " n_atoms"],
+    cutoff: Float[Array, ""],
+    atoms_per_z_batch: int,
+    gaussian_integrals_per_interval_per_atom_x: Inexact[
+        Array, "n_gaussians_per_atom n_atoms dim_x"
+    ],
+    gaussian_integrals_per_interval_per_atom_y: Inexact[
+        Array, "dim_y n_gaussians_per_atom n_atoms"
+    ],
+    xs: tuple[
+        Inexact[Array, "... n_gaussians_per_atom n_atoms"],
+        Float[Array, "..."],
+        Float[Array, "..."],
+    ],
+) -> Inexact[Array, "... dim_y dim_x"]:
+    """Evaluate the potential at a z-plane or a batch of z-planes, only
+    contracting over a window of atoms sorted by their z-coordinate.
+    """
+    gaussian_integrals_per_atom_z, lower_edges_z, upper_edges_z = xs
+    # Find the range of atoms within the cutoff of the z-planes
+    start_index, stop_index = jnp.searchsorted(
+        sorted_atom_positions_z,
+        jnp.asarray([jnp.min(lower_edges_z) - cutoff, jnp.max(upper_edges_z) + cutoff]),
+    )
+    start_index = eqx.error_if(
+        jnp.minimum(start_index, sorted_atom_positions_z.size - atoms_per_z_batch),
+        stop_index - start_index > atoms_per_z_batch,
+        "Tried to build a voxel grid from atoms with `atoms_per_z_batch` less "
+        "than the number of atoms that overlap with a batch of z-planes. Try "
+        "increasing `atoms_per_z_batch`.",
+    )
+    # ... and only contract over these atoms
+    take_atoms = lambda x, axis: jax.lax.dynamic_slice_in_dim(
+        x, start_index, atoms_per_z_batch, axis=axis
+    )
+    return evaluate_potential(
+        take_atoms(gaussian_integrals_per_interval_per_atom_x, 1),
+        take_atoms(gaussian_integrals_per_interval_per_atom_y, 2),
+        take_atoms(gaussian_integrals_per_atom_z, gaussian_integrals_per_atom_z.ndim - 1),
+    )
+
+
+@eqx.filter_jit
+def _add_atom_boxes_to_voxel_grid(
+    voxel_grid: Float[Array, "dim_z dim_y dim_x"],
+    edge_grid_x: Float[Array, " n_edges_x"],
+    edge_grid_y: Float[Array, " n_edges_y"],
+    edge_grid_z: Float[Array, " n_edges_z"],
+    voxel_size: Float[Array, ""],
+    atom_positions: Float[Array, "n_atoms_in_batch 3"],
+    prefactor: Float[Array, "n_atoms_in_batch n_gaussians_per_atom"],
+    scaling: Float[Array, "n_atoms_in_batch n_gaussians_per_atom"],
+    atom_box_size: int,
+    intermediate_dtype: Optional[DTypeLike] = None,
+) -> Float[Array, "dim_z dim_y dim_x"]:
+    # Evaluate 1D gaussian integrals for each of x, y, and z dimensions, only
+    # in a box of voxels surrounding each atom
+    (
+        (gaussian_integrals_per_interval_per_atom_x, box_indices_x),
+        (gaussian_integrals_per_interval_per_atom_y, box_indices_y),
+        (gaussian_integrals_per_interval_per_atom_z, box_indices_z),
+    ) = (
+        _evaluate_gaussian_integrals_in_atom_boxes(
+            edge_grid, atom_positions[:, i], scaling, voxel_size, atom_box_size
+        )
+        for i, edge_grid in enumerate((edge_grid_x, edge_grid_y, edge_grid_z))
+    )
+    # Multiply the prefactor onto one of the gaussians and optionally store
+    # the integrals in a lower precision
+    gaussian_integrals_times_prefactor_per_interval_per_atom_x = (
+        prefactor[:, None, :] * gaussian_integrals_per_interval_per_atom_x
+    )
+    if intermediate_dtype is not None:
+        (
+            gaussian_integrals_times_prefactor_per_interval_per_atom_x,
+            gaussian_integrals_per_interval_per_atom_y,
+            gaussian_integrals_per_interval_per_atom_z,
+        ) = (
+            gaussian_integrals_times_prefactor_per_interval_per_atom_x.astype(
+                intermediate_dtype
+            ),
+            gaussian_integrals_per_interval_per_atom_y.astype(intermediate_dtype),
+            gaussian_integrals_per_interval_per_atom_z.astype(intermediate_dtype),
+        )
+    # Compute the potential in the box around each atom
+    potential_per_atom_box = jnp.einsum(
+        "axg,ayg,azg->azyx",
+        gaussian_integrals_times_prefactor_per_interval_per_atom_x,
+        gaussian_integrals_per_interval_per_atom_y,
+        gaussian_integrals_per_interval_per_atom_z,
+        preferred_element_type=voxel_grid.dtype,
+    )
+    # Scatter-add the boxes into the voxel grid
+    return voxel_grid.at[
+        box_indices_z[:, :, None, None],
+        box_indices_y[:, None, :, None],
+        box_indices_x[:, None, None, :],
+    ].add(potential_per_atom_box)
+
+
+@functools.partial(
+    jax.checkpoint,
+    policy=jax.checkpoint_policies.dots_with_no_batch_dims_saveable,
+    static_argnums=(4,),
+)
+def _evaluate_gaussian_integrals_in_atom_boxes(
+    edge_grid: Float[Array, " n_edges"],
+    atom_positions: Float[Array, " n_atoms"],
+    scaling: Float[Array, "n_atoms n_gaussians_per_atom"],
+    voxel_size: Float[Array, ""],
+    atom_box_size: int,
+) -> tuple[
+    Float[Array, "n_atoms {atom_box_size} n_gaussians_per_atom"],
+    Int[Array, "n_atoms {atom_box_size}"],
+]:
+    """Evaluate 1D averaged gaussians along one dimension in a box of
+    voxels surrounding each atom, returning the gaussian integrals
+    and the indices of the box in the grid. As for the full grid, the error
+    functions are recomputed on the backward pass.
+    """
+    # Find the index of the first voxel in each box. The grid is centered
+    # so that `grid[i] = (i - dim // 2) * voxel_size`, and boxes at the edge
+    # of the grid are shifted to lie inside it
+    dim = edge_grid.size - 1
+    atom_indices = jnp.round(atom_positions / voxel_size).astype(int) + dim // 2
+    box_start_indices = jnp.clip(
+        atom_indices - atom_box_size // 2, 0, dim - atom_box_size
+    )
+    # Gather the voxel edges in each box with a single indexing operation and
+    # compute the gaussian integrals as the difference of error functions at
+    # the edges. The indices of the voxels in each box are the indices of all
+    # but the last edge
+    edge_indices = box_start_indices[:, None] + jnp.arange(atom_box_size + 1)
+    delta = edge_grid[edge_indices] - atom_positions[:, None]
+    gaussian_integrals = jnp.diff(
+        jsp.special.erf(scaling[:, None, :] * delta[:, :, None]), axis=1
+    )
+    return gaussian_integrals, edge_indices[:, :-1]
+
+
 @eqx.filter_jit
+@functools.partial(
+    jax.checkpoint, policy=jax.checkpoint_policies.dots_with_no_batch_dims_saveable
+)
 def _evaluate_gaussian_integrals_for_all_atoms_and_intervals(
-    grid_x: Float[Array, " dim_x"],
-    grid_y: Float[Array, " dim_y"],
-    grid_z: Float[Array, " dim_z"],
+    edge_grid_x: Float[Array, " n_edges_x"],
+    edge_grid_y: Float[Array, " n_edges_y"],
+    edge_grid_z: Float[Array, " n_edges_z"],
     atom_positions: Float[Array, "n_atoms 3"],
-    a: Float[Array, "n_atoms n_gaussians_per_atom"],
-    b: Float[Array, "n_atoms n_gaussians_per_atom"],
-    voxel_size: Float[Array, ""],
+    prefactor: Float[Array, "n_atoms n_gaussians_per_atom"],
+    scaling: Float[Array, "n_atoms n_gaussians_per_atom"],
 ) -> tuple[
-    Float[Array, "dim_x n_atoms n_gaussians_per_atom"],
-    Float[Array, "dim_y n_atoms n_gaussians_per_atom"],
-    Float[Array, "dim_z n_atoms n_gaussians_per_atom"],
+    Float[Array, "n_gaussians_per_atom n_atoms dim_x"],
+    Float[Array, "dim_y n_gaussians_per_atom n_atoms"],
+    Float[Array, "dim_z n_gaussians_per_atom n_atoms"],
 ]:
     """Evaluate 1D averaged gaussians in x, y, and z dimensions
     for each atom and each gaussian per atom.
+
+    The integrals are returned in the layout used by the contraction over
+    atoms at each z-plane, so that no transposes are needed downstream.
+    When differentiating, the error functions are recomputed on the backward
+    pass rather than stored, which reduces peak memory.
     """
-    # Define function to compute integrals for each dimension
-    scaling = 2 * jnp.pi / jnp.sqrt(b)
-    integration_kernel = lambda delta: (
-        jsp.special.erf(scaling[None, :, :] * (delta + voxel_size)[:, :, None])
-        - jsp.special.erf(scaling[None, :, :] * delta[:, :, None])
-    )
-    # Compute outer product of left edge of grid points minus atomic positions
-    left_edge_grid_x, left_edge_grid_y, left_edge_grid_z = (
-        grid_x - voxel_size / 2,
-        grid_y - voxel_size / 2,
-        grid_z - voxel_size / 2,
-    )
+    # Define function to compute integrals for each dimension. The
+    # integral over a voxel is the difference of error functions evaluated
+    # at its edges, and adjacent voxels share an edge. Evaluate the error
+    # function once per edge and difference along the grid axis
+    scaling = scaling.T
+    # Compute outer product of the voxel edges minus atomic positions
     delta_x, delta_y, delta_z = (
-        left_edge_grid_x[:, None] - atom_positions[:, 0],
-        left_edge_grid_y[:, None] - atom_positions[:, 1],
-        left_edge_grid_z[:, None] - atom_positions[:, 2],
+        edge_grid_x[:, None] - atom_positions[:, 0],
+        edge_grid_y[:, None] - atom_positions[:, 1],
+        edge_grid_z[:, None] - atom_positions[:, 2],
     )
     # Compute gaussian integrals for each grid point, each atom, and
     # each gaussian per atom
     gauss_x, gauss_y, gauss_z = (
-        integration_kernel(delta_x),
-        integration_kernel(delta_y),
-        integration_kernel(delta_z),
+        jnp.diff(jsp.special.erf(scaling[:, :, None] * delta_x.T[None, :, :]), axis=2),
+        jnp.diff(jsp.special.erf(scaling[None, :, :] * delta_y[:, None, :]), axis=0),
+        jnp.diff(jsp.special.erf(scaling[None, :, :] * delta_z[:, None, :]), axis=0),
     )
-    # Compute the prefactors for each atom and each gaussian per atom
-    # for the potential
-    prefactor = (4 * jnp.pi * a) / (2 * voxel_size) ** 3
     # Multiply the prefactor onto one of the gaussians for efficiency
-    return prefactor * gauss_x, gauss_y, gauss_z
+    return prefactor.T[:, :, None] * gauss_x, gauss_y, gauss_z
+
+
+def _make_voxel_edge_grid(
+    grid: Float[Array, " dim"], voxel_size: Float[Array, ""]
+) -> Float[Array, " dim+1"]:
+    """Get the `dim + 1` edges of the voxels centered on `grid`."""
+    left_edge_grid = grid - voxel_size / 2
+    return jnp.append(left_edge_grid, left_edge_grid[-1] + voxel_size)
 
 
 def _evaluate_gaussian_potential_at_z_plane(
-    gaussian_integrals_per_interval_per_atom_x: Float[
-        Array, "dim_x n_atoms n_gaussians_per_atom"
+    gaussian_integrals_per_interval_per_atom_x: Inexact[
+        Array, "n_gaussians_per_atom n_atoms dim_x"
     ],
-    gaussian_integrals_per_interval_per_atom_y: Float[
-        Array, "dim_y n_atoms n_gaussians_per_atom"
+    gaussian_integrals_per_interval_per_atom_y: Inexact[
+        Array, "dim_y n_gaussians_per_atom n_atoms"
     ],
-    gaussian_integrals_per_atom_z: Float[Array, "n_atoms n_gaussians_per_atom"],
-) -> Float[Array, "dim_y dim_x"]:
-    # Prepare matrices with dimensions of the number of atoms and the number of grid
-    # points. There are as many matrices as number of gaussians per atom
-    gauss_x = jnp.transpose(gaussian_integrals_per_interval_per_atom_x, (2, 1, 0))
-    gauss_yz = jnp.transpose(
-        gaussian_integrals_per_interval_per_atom_y
-        * gaussian_integrals_per_atom_z[None, :, :],
-        (2, 0, 1),
+    gaussian_integrals_per_atom_z: Inexact[Array, "n_gaussians_per_atom n_atoms"],
+    accumulation_dtype: Optional[DTypeLike] = None,
+) -> Inexact[Array, "dim_y dim_x"]:
+    # The integrals are stored so that the gaussians per atom and the atoms
+    # are adjacent axes. Flatten them into a single contracted axis, so that
+    # the z-plane is one matrix multiplication
+    gauss_x = gaussian_integrals_per_interval_per_atom_x
+    gauss_yz = gaussian_integrals_per_interval_per_atom_y * gaussian_integrals_per_atom_z
+    return jnp.matmul(
+        gauss_yz.reshape((gauss_yz.shape[0], -1)),
+        gauss_x.reshape((-1, gauss_x.shape[-1])),
+        preferred_element_type=accumulation_dtype,
     )
-    # Compute matrix multiplication then sum over the number of gaussians per atom
-    return jnp.sum(jnp.matmul(gauss_yz, gauss_x), axis=0)
 
 
-@eqx.filter_jit
-def _batched_map(
-    fun: Callable,
-    xs: PyTree[Array],
-    batch_size: int,
-    is_batch_axis_contracted: bool = False,
-):
-    """Like `jax.lax.map`, but map over leading axis of `xs` in
-    chunks of size `batch_size`. Assumes `fun` can be evaluated in
-    parallel over this leading axis.
-    """
-    # ... reshape into an iterative dimension and a batching dimension
-    batch_dim = jtu.tree_leaves(xs)[0].shape[0]
-    n_batches = batch_dim // batch_size
-    xs_per_batch = jtu.tree_map(
-        lambda x: x[: batch_dim - batch_dim % batch_size, ...].reshape(
-            (n_batches, batch_size, *x.shape[1:])
-        ),
-        xs,
+def _evaluate_gaussian_potential_at_z_planes(
+    gaussian_integrals_per_interval_per_atom_x: Inexact[
+        Array, "n_gaussians_per_atom n_atoms dim_x"
+    ],
+    gaussian_integrals_per_interval_per_atom_y: Inexact[
+        Array, "dim_y n_gaussians_per_atom n_atoms"
+    ],
+    gaussian_integrals_per_interval_per_atom_z: Inexact[
+        Array, "dim_z n_gaussians_per_atom n_atoms"
+    ],
+    accumulation_dtype: Optional[DTypeLike] = None,
+) -> Inexact[Array, "dim_z dim_y dim_x"]:
+    # The potential is separable in x, y, and z, so a batch of z-planes is
+    # a single general matrix multiplication over the flattened gaussians
+    # per atom and atoms
+    gauss_x = gaussian_integrals_per_interval_per_atom_x
+    gauss_yz = (
+        gaussian_integrals_per_interval_per_atom_y[None, :, :, :]
+        * gaussian_integrals_per_interval_per_atom_z[:, None, :, :]
     )
-    # .. compute the result and reshape back into one leading dimension
-    result_per_batch = jax.lax.map(fun, xs_per_batch)
-    if is_batch_axis_contracted:
-        result = result_per_batch
+    return jax.lax.dot_general(
+        gauss_yz.reshape((*gauss_yz.shape[:2], -1)),
+        gauss_x.reshape((-1, gauss_x.shape[-1])),
+        dimension_numbers=(((2,), (0,)), ((), ())),
+        preferred_element_type=accumulation_dtype,
+    )
+
+
+def _build_real_space_voxel_potential_from_atoms_with_numba(
+    edge_grid_x: Float[Array, " n_edges_x"],
+    edge_grid_y: Float[Array, " n_edges_y"],
+    edge_grid_z: Float[Array, " n_edges_z"],
+    voxel_size: Float[Array, ""],
+    atom_positions: Float[Array, "n_atoms 3"],
+    prefactor: Float[Array, "n_atoms n_gaussians_per_atom"],
+    scaling: Float[Array, "n_atoms n_gaussians_per_atom"],
+    atom_box_size: Optional[int] = None,
+) -> Float[Array, "dim_z dim_y dim_x"]:
+    # Get the kernel at trace time, so that it is clear if `numba` is not installed
+    _ = _get_numba_voxel_potential_kernel()
+    shape = (edge_grid_z.size - 1, edge_grid_y.size - 1, edge_grid_x.size - 1)
+    dtype = jnp.result_type(atom_positions, prefactor, scaling)
+    return jax.pure_callback(
+        functools.partial(_evaluate_voxel_potential_on_host, atom_box_size=atom_box_size),
+        jax.ShapeDtypeStruct(shape, dtype),
+        edge_grid_x,
+        edge_grid_y,
+        edge_grid_z,
+        voxel_size,
+        atom_positions,
+        prefactor,
+        scaling,
+    )
+
+
+def _evaluate_voxel_potential_on_host(
+    edge_grid_x: Float[Array, " n_edges_x"] | Float[np.ndarray, " n_edges_x"],
+    edge_grid_y: Float[Array, " n_edges_y"] | Float[np.ndarray, " n_edges_y"],
+    edge_grid_z: Float[Array, " n_edges_z"] | Float[np.ndarray, " n_edges_z"],
+    voxel_size: Float[Array, ""] | Float[np.ndarray, ""],
+    atom_positions: Float[Array, "n_atoms 3"] | Float[np.ndarray, "n_atoms 3"],
+    prefactor: (
+        Float[Array, "n_atoms n_gaussians_per_atom"]
+        | Float[np.ndarray, "n_atoms n_gaussians_per_atom"]
+    ),
+    scaling: (
+        Float[Array, "n_atoms n_gaussians_per_atom"]
+        | Float[np.ndarray, "n_atoms n_gaussians_per_atom"]
+    ),
+    *,
+    atom_box_size: Optional[int],
+) -> Float[np.ndarray, "dim_z dim_y dim_x"]:
+    kernel = _get_numba_voxel_potential_kernel()
+    import numba
+
+    shape = (edge_grid_z.size - 1, edge_grid_y.size - 1, edge_grid_x.size - 1)
+    if atom_box_size is None:
+        box_size_z, box_size_y, box_size_x = shape
     else:
-        result = result_per_batch.reshape(
-            (n_batches * batch_size, *result_per_batch.shape[2:])
-        )
-    # ... if the batch dimension is not divisible by the batch size, need
-    # to take care of the remainder
-    if batch_dim % batch_size != 0:
-        remainder = fun(
-            jtu.tree_map(lambda x: x[batch_dim - batch_dim % batch_size :, ...], xs)
-        )
-        if is_batch_axis_contracted:
-            remainder = remainder[None, ...]
-        result = jnp.concatenate([result, remainder], axis=0)
-    return result
+        box_size_z = box_size_y = box_size_x = atom_box_size
+    voxel_grid = kernel(
+        np.asarray(edge_grid_x, dtype=np.float64),
+        np.asarray(edge_grid_y, dtype=np.float64),
+        np.asarray(edge_grid_z, dtype=np.float64),
+        float(voxel_size),
+        np.asarray(atom_positions, dtype=np.float64),
+        np.asarray(prefactor, dtype=np.float64),
+        np.asarray(scaling, dtype=np.float64),
+        box_size_x,
+        box_size_y,
+        box_size_z,
+        numba.get_num_threads(),
+    )
+    return voxel_grid.astype(np.result_type(atom_positions, prefactor, scaling))
+
+
+@functools.cache
+def _get_numba_voxel_potential_kernel() -> Callable:
+    try:
+        from ._numba_kernels import evaluate_voxel_potential_kernel
+    except ModuleNotFoundError as err:
+        raise ModuleNotFoundError(
+            "Tried to build a voxel grid from atoms with `use_numba = True`, "
+            "but `numba` is not installed. Install it with "
+            "`pip install cryojax[numba]`, or set `use_numba = False`."
+        ) from err
+
+    return evaluate_voxel_potential_kernel
@@ -3,7 +3,6 @@ from typing import Optional
 from typing_extensions import override
 
 import equinox as eqx
-import jax.numpy as jnp
 from jaxtyping import Array, Complex, PRNGKeyArray
 
 from ...image import fftn, ifftn, rfftn
@@ -74,9 +73,8 @@ class AbstractWaveScatteringTheory(AbstractScatteringTheory, strict=True):
         wavefunction_at_detector_plane = ifftn(fourier_wavefunction_at_detector_plane)
         # ... get the squared wavefunction and return to fourier space
         intensity_spectrum_at_detector_plane = rfftn(
-            (
-                wavefunction_at_detector_plane * jnp.conj(wavefunction_at_detector_plane)
-            ).real
+            wavefunction_at_detector_plane.real**2
+            + wavefunction_at_detector_plane.imag**2
         )
         # ... apply translation
         translational_phase_shifts = self.structural_ensemble.pose.compute_shifts(
@@ -108,8 +106,9 @@ class AbstractWaveScatteringTheory(AbstractScatteringTheory, strict=True):
         wavefunction_at_detector_plane = ifftn(fourier_wavefunction_at_detector_plane)
         # ... get the squared wavefunction
         squared_wavefunction_at_detector_plane = (
-            wavefunction_at_detector_plane * jnp.conj(wavefunction_at_detector_plane)
-        ).real
+            wavefunction_at_detector_plane.real**2
+            + wavefunction_at_detector_plane.imag**2
+        )
         # ... compute the contrast directly from the squared wavefunction
         # as C = -1 + psi^2 / 1 + psi^2
         contrast_spectrum_at_detector_plane = rfftn(
@@ -1,13 +1,14 @@
 from abc import abstractmethod
-from typing import Optional
+from functools import cached_property
+from typing import Callable, Optional
 from typing_extensions import override
 
 import equinox as eqx
 import jax
 import jax.numpy as jnp
-from jaxtyping import Array, Complex, PRNGKeyArray
+from jaxtyping import Array, Complex, Float, PRNGKeyArray, PyTree
 
-from ...utils import get_filter_spec
+from ...utils import batched_scan
 from .._instrument_config import InstrumentConfig
 from .._pose import AbstractPose
 from .._potential_integrator import AbstractPotentialIntegrator
@@ -54,8 +55,13 @@ class AbstractWeakPhaseScatteringTheory(AbstractScatteringTheory, strict=True):
         contrast_spectrum_at_detector_plane = (
             self.compute_contrast_spectrum_at_detector_plane(instrument_config, rng_key)
         )
+        # The constant only enters the zero mode. Add it with an elementwise
+        # mask, rather than an indexed update, so that it fuses with the `2 * C`
+        y_dim, x_dim = contrast_spectrum_at_detector_plane.shape
+        is_zero_mode = (jnp.arange(y_dim) == 0)[:, None] & (jnp.arange(x_dim) == 0)
         intensity_spectrum_at_detector_plane = (
-            (2 * contrast_spectrum_at_detector_plane).at[0, 0].add(1.0 * N1 * N2)
+            2 * contrast_spectrum_at_detector_plane
+            + jnp.where(is_zero_mode, 1.0 * N1 * N2, 0.0)
         )
         return intensity_spectrum_at_detector_plane
 
@@ -127,16 +133,15 @@ class WeakPhaseScatteringTheory(AbstractWeakPhaseScatteringTheory, strict=True):
         object_spectrum_at_exit_plane = self.compute_object_spectrum_at_exit_plane(
             instrument_config, rng_key
         )
-        contrast_spectrum_at_detector_plane = self.transfer_theory.propagate_object_to_detector_plane(  # noqa: E501
-            object_spectrum_at_exit_plane,
-            instrument_config,
-            is_projection_approximation=self.potential_integrator.is_projection_approximation,
-        )
-        # ... apply in-plane translation
-        translational_phase_shifts = self.structural_ensemble.pose.compute_shifts(
-            instrument_config.padded_frequency_grid_in_angstroms
+        contrast_spectrum_at_detector_plane = (
+            _propagate_object_spectrum_to_detector_plane(
+                object_spectrum_at_exit_plane,
+                self.structural_ensemble.pose,
+                self.potential_integrator,
+                self.transfer_theory,
+                instrument_config,
+            )
         )
-        contrast_spectrum_at_detector_plane *= translational_phase_shifts
 
         return contrast_spectrum_at_detector_plane
 
@@ -150,7 +155,8 @@ class LinearSuperpositionScatteringTheory(AbstractWeakPhaseScatteringTheory, str
     assembly: AbstractAssembly
     potential_integrator: AbstractPotentialIntegrator
     transfer_theory: ContrastTransferTheory
-    solvent: Optional[AbstractIce] = None
+    solvent: Optional[AbstractIce]
+    batch_size: Optional[int]
 
     def __init__(
         self,
@@ -158,6 +164,8 @@ class LinearSuperpositionScatteringTheory(AbstractWeakPhaseScatteringTheory, str
         potential_integrator: AbstractPotentialIntegrator,
         transfer_theory: ContrastTransferTheory,
         solvent: Optional[AbstractIce] = None,
+        *,
+        batch_size: Optional[int] = None,
     ):
         """**Arguments:**
 
@@ -167,11 +175,50 @@ class LinearSuperpositionScatteringTheory(AbstractWeakPhaseScatteringTheory, str
         - `potential_integrator`: The method for integrating the specimen potential.
         - `transfer_theory`: The contrast transfer theory.
         - `solvent`: The model for the solvent.
+        - `batch_size`: The number of subunits for which to compute images
+              in parallel. If `None`, images of all subunits are computed
+              in parallel with `jax.vmap`. Otherwise, loop over chunks of
+              `batch_size` subunits and accumulate the superposition, which
+              trades throughput for a lower memory footprint.
         """
         self.assembly = assembly
         self.potential_integrator = potential_integrator
         self.transfer_theory = transfer_theory
         self.solvent = solvent
+        self.batch_size = batch_size
+
+    def __check_init__(self):
+        if self.batch_size is not None and self.batch_size < 1:
+            raise AttributeError(
+                "`LinearSuperpositionScatteringTheory.batch_size` must "
+                f"be greater than `1`. Got a value of {self.batch_size}."
+            )
+
+    @cached_property
+    def _partitioned_subunits_and_z_positions(
+        self,
+    ) -> tuple[
+        AbstractStructuralEnsemble,
+        AbstractStructuralEnsemble,
+        Float[Array, " {self.assembly.n_subcomponents}"],
+    ]:
+        """The subunits of the assembly in the lab frame, partitioned into
+        the pose and conformation (which are vmapped over) and everything
+        else. Also, return the z-position of each subunit.
+        """
+        ensemble_batch, z_positions = (
+            self.assembly.get_subcomponents_and_z_positions_in_lab_frame()
+        )
+        is_vmapped = lambda x: isinstance(
+            x, (AbstractPose, AbstractConformationalVariable)
+        )
+        filter_spec_for_ensemble = jax.tree_util.tree_map(
+            is_vmapped, ensemble_batch, is_leaf=is_vmapped
+        )
+        ensemble_vmap, ensemble_novmap = eqx.partition(
+            ensemble_batch, filter_spec_for_ensemble
+        )
+        return ensemble_vmap, ensemble_novmap, z_positions
 
     @override
     def compute_object_spectrum_at_exit_plane(
@@ -181,38 +228,15 @@ class LinearSuperpositionScatteringTheory(AbstractWeakPhaseScatteringTheory, str
     ) -> Complex[
         Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}"
     ]:
-        def compute_image(ensemble_mapped, ensemble_no_mapped, instrument_config):
-            ensemble = eqx.combine(ensemble_mapped, ensemble_no_mapped)
-            object_spectrum_at_exit_plane = (
-                _compute_object_spectrum_from_scattering_potential(
-                    ensemble, self.potential_integrator, instrument_config
-                )
-            )
-            return object_spectrum_at_exit_plane
-
-        @eqx.filter_jit
-        def compute_image_superposition(
-            ensemble_mapped, ensemble_no_mapped, instrument_config
-        ):
-            return jnp.sum(
-                jax.lax.map(
-                    lambda x: compute_image(x, ensemble_no_mapped, instrument_config),
-                    ensemble_mapped,
-                ),
-                axis=0,
-            )
-
-        # Get the batch
-        ensemble_batch, _ = self.assembly.get_subcomponents_and_z_positions_in_lab_frame()
-        # Setup vmap over the pose and conformation
-        is_mapped = lambda x: isinstance(
-            x, (AbstractPose, AbstractConformationalVariable)
-        )
-        to_mapped = jax.tree_util.tree_map(is_mapped, ensemble_batch, is_leaf=is_mapped)
-        mapped, no_mapped = eqx.partition(ensemble_batch, to_mapped)
-
-        object_spectrum_at_exit_plane = compute_image_superposition(
-            mapped, no_mapped, instrument_config
+        # Get the batch, partitioned for vmap over the pose and conformation
+        ensemble_vmap, ensemble_novmap, _ = self._partitioned_subunits_and_z_positions
+        # ... and compute the superposition of images
+        object_spectrum_at_exit_plane = _sum_images_over_subunits(
+            _compute_object_spectrum_of_subunit,
+            ensemble_vmap,
+            (ensemble_novmap, self.potential_integrator),
+            instrument_config,
+            self.batch_size,
         )
 
         if rng_key is not None:
@@ -237,74 +261,31 @@ class LinearSuperpositionScatteringTheory(AbstractWeakPhaseScatteringTheory, str
     ) -> Complex[
         Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}"
     ]:
-        def compute_image(pytree_vmap, pytree_novmap, instrument_config):
-            ensemble_vmap, transfer_vmap = pytree_vmap
-            ensemble_novmap, transfer_novmap = pytree_novmap
-            ensemble = eqx.combine(ensemble_vmap, ensemble_novmap)
-            transfer_theory = eqx.combine(transfer_vmap, transfer_novmap)
-            object_spectrum_at_exit_plane = (
-                _compute_object_spectrum_from_scattering_potential(
-                    ensemble, self.potential_integrator, instrument_config
-                )
-            )
-            translational_phase_shifts = ensemble.pose.compute_shifts(
-                instrument_config.padded_frequency_grid_in_angstroms
-            )
-            contrast_spectrum_at_detector_plane = transfer_theory.propagate_object_to_detector_plane(  # noqa: E501
-                object_spectrum_at_exit_plane,
-                instrument_config,
-                is_projection_approximation=self.potential_integrator.is_projection_approximation,
-            )
-
-            return translational_phase_shifts * contrast_spectrum_at_detector_plane
-
-        @eqx.filter_jit
-        def compute_image_superposition(pytree_vmap, pytree_novmap, instrument_config):
-            return jnp.sum(
-                jax.lax.map(
-                    lambda x: compute_image(x, pytree_novmap, instrument_config),
-                    pytree_vmap,
-                ),
-                axis=0,
-            )
-
         # Get the batches
-        ensemble_batch, z_positions = (
-            self.assembly.get_subcomponents_and_z_positions_in_lab_frame()
-        )
-        transfer_theory_batch = eqx.tree_at(
-            lambda x: x.ctf.defocus_in_angstroms,
-            self.transfer_theory,
-            self.transfer_theory.ctf.defocus_in_angstroms + z_positions,
-        )
-        # Setup vmap over the pose and conformation
-        is_vmapped = lambda x: isinstance(
-            x, (AbstractPose, AbstractConformationalVariable)
-        )
-        filter_spec_for_ensemble = jax.tree_util.tree_map(
-            is_vmapped, ensemble_batch, is_leaf=is_vmapped
+        ensemble_vmap, ensemble_novmap, z_positions = (
+            self._partitioned_subunits_and_z_positions
         )
-        ensemble_vmap, ensemble_novmap = eqx.partition(
-            ensemble_batch, filter_spec_for_ensemble
-        )
-        # ... setup vmap over the CTF
-        filter_spec_for_transfer_theory = get_filter_spec(
-            self.transfer_theory, lambda x: x.ctf.defocus_in_angstroms
-        )
-        transfer_vmap, transfer_novmap = eqx.partition(
-            transfer_theory_batch, filter_spec_for_transfer_theory
-        )
-        contrast_spectrum_at_detector_plane = compute_image_superposition(
-            (ensemble_vmap, transfer_vmap),
-            (ensemble_novmap, transfer_novmap),
+        # ... the CTF only changes by the defocus of each subunit, so vmap over
+        # the defocus directly rather than partitioning a batch of CTFs
+        defocus_in_angstroms = self.transfer_theory.ctf.defocus_in_angstroms + z_positions
+        # ... the envelope does not depend on the defocus, so apply it once to the
+        # superposition rather than to the image of every subunit
+        envelope = self.transfer_theory.envelope
+        transfer_theory = eqx.tree_at(lambda x: x.envelope, self.transfer_theory, None)
+        # ... and compute the superposition of images
+        contrast_spectrum_at_detector_plane = _sum_images_over_subunits(
+            _compute_contrast_spectrum_of_subunit,
+            (ensemble_vmap, defocus_in_angstroms),
+            (ensemble_novmap, transfer_theory, self.potential_integrator),
             instrument_config,
+            self.batch_size,
         )
 
         if rng_key is not None:
             # Get the contrast from the ice and add to that of the image batch
             if self.solvent is not None:
                 fourier_ice_contrast_at_detector_plane = (
-                    self.transfer_theory.propagate_object_to_detector_plane(
+                    transfer_theory.propagate_object_to_detector_plane(
                         self.solvent.sample_ice_spectrum(rng_key, instrument_config),
                         instrument_config,
                         is_projection_approximation=True,
@@ -314,11 +295,23 @@ class LinearSuperpositionScatteringTheory(AbstractWeakPhaseScatteringTheory, str
                     fourier_ice_contrast_at_detector_plane
                 )
 
+        if envelope is not None:
+            contrast_spectrum_at_detector_plane *= envelope(
+                instrument_config.padded_frequency_grid_in_angstroms
+            )
+
         return contrast_spectrum_at_detector_plane
 
 
 def _compute_object_spectrum_from_scattering_potential(
-    structural_ensemble, potential_integrator, instrument_config
+    structural_ensemble: AbstractStructuralEnsemble,
+    potential_integrator: AbstractPotentialIntegrator,
+    instrument_config: InstrumentConfig,
+) -> (
+    Complex[
+        Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}"
+    ]
+    | Complex[Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim}"]
 ):
     # Get potential in the lab frame
     potential = structural_ensemble.get_potential_in_lab_frame()
@@ -333,3 +326,119 @@ def _compute_object_spectrum_from_scattering_potential(
         fourier_integrated_potential, instrument_config.wavelength_in_angstroms
     )
     return phase_shifts_in_exit_plane
+
+
+def _propagate_object_spectrum_to_detector_plane(
+    object_spectrum_at_exit_plane: (
+        Complex[
+            Array,
+            "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}",
+        ]
+        | Complex[
+            Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim}"
+        ]
+    ),
+    pose: AbstractPose,
+    potential_integrator: AbstractPotentialIntegrator,
+    transfer_theory: ContrastTransferTheory,
+    instrument_config: InstrumentConfig,
+) -> Complex[
+    Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}"
+]:
+    contrast_spectrum_at_detector_plane = (
+        transfer_theory.propagate_object_to_detector_plane(
+            object_spectrum_at_exit_plane,
+            instrument_config,
+            is_projection_approximation=potential_integrator.is_projection_approximation,
+        )
+    )
+    # ... apply in-plane translation
+    translational_phase_shifts = pose.compute_shifts(
+        instrument_config.padded_frequency_grid_in_angstroms
+    )
+    return translational_phase_shifts * contrast_spectrum_at_detector_plane
+
+
+def _compute_object_spectrum_of_subunit(
+    ensemble_vmap: AbstractStructuralEnsemble,
+    pytree_novmap: tuple[AbstractStructuralEnsemble, AbstractPotentialIntegrator],
+    instrument_config: InstrumentConfig,
+) -> (
+    Complex[
+        Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}"
+    ]
+    | Complex[Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim}"]
+):
+    ensemble_novmap, potential_integrator = pytree_novmap
+    ensemble = eqx.combine(ensemble_vmap, ensemble_novmap)
+    return _compute_object_spectrum_from_scattering_potential(
+        ensemble, potential_integrator, instrument_config
+    )
+
+
+def _compute_contrast_spectrum_of_subunit(
+    pytree_vmap: tuple[AbstractStructuralEnsemble, Float[Array, ""]],
+    pytree_novmap: tuple[
+        AbstractStructuralEnsemble, ContrastTransferTheory, AbstractPotentialIntegrator
+    ],
+    instrument_config: InstrumentConfig,
+) -> Complex[
+    Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}"
+]:
+    ensemble_vmap, defocus_in_angstroms = pytree_vmap
+    ensemble_novmap, transfer_theory, potential_integrator = pytree_novmap
+    ensemble = eqx.combine(ensemble_vmap, ensemble_novmap)
+    transfer_theory = eqx.tree_at(
+        lambda x: x.ctf.defocus_in_angstroms, transfer_theory, defocus_in_angstroms
+    )
+    object_spectrum_at_exit_plane = _compute_object_spectrum_from_scattering_potential(
+        ensemble, potential_integrator, instrument_config
+    )
+    return _propagate_object_spectrum_to_detector_plane(
+        object_spectrum_at_exit_plane,
+        ensemble.pose,
+        potential_integrator,
+        transfer_theory,
+        instrument_config,
+    )
+
+
+@eqx.filter_jit
+def _sum_images_over_subunits(
+    compute_image: Callable[[PyTree, PyTree, InstrumentConfig], Array],
+    pytree_vmap: PyTree,
+    pytree_novmap: PyTree,
+    instrument_config: InstrumentConfig,
+    batch_size: Optional[int],
+) -> Array:
+    compute_images = eqx.filter_vmap(compute_image, in_axes=(0, None, None))
+    if batch_size is None:
+        # ... compute all images in parallel
+        return jnp.sum(
+            compute_images(pytree_vmap, pytree_novmap, instrument_config), axis=0
+        )
+    else:
+        # ... otherwise, accumulate the superposition over chunks of subunits
+        # in the carry of a scan, rather than storing every image. The carry is
+        # allocated within the trace, so XLA updates it in place without any
+        # buffer donation. The inputs are not donated, since they are views of
+        # the user's assembly
+        def accumulate_images(superposition, x):
+            images = compute_images(x, pytree_novmap, instrument_config)
+            return superposition + jnp.sum(images, axis=0), None
+
+        # Get the shape of an image without computing it. Pass everything as an
+        # argument so that no cached properties are set on the closed-over inputs
+        image_shape_and_dtype = eqx.filter_eval_shape(
+            compute_image,
+            jax.tree.map(lambda x: x[0], pytree_vmap),
+            pytree_novmap,
+            instrument_config,
+        )
+        superposition, _ = batched_scan(
+            accumulate_images,
+            jnp.zeros(image_shape_and_dtype.shape, image_shape_and_dtype.dtype),
+            pytree_vmap,
+            batch_size=batch_size,
+        )
+        return superposition
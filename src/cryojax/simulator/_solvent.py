@@ -10,7 +10,6 @@ import jax.random as jr
 from equinox import Module
 from jaxtyping import Array, Complex, PRNGKeyArray
 
-from ..image import fftn, irfftn
 from ..image.operators import FourierOperatorLike
 from ._instrument_config import InstrumentConfig
 from ._scattering_theory import convert_units_of_integrated_potential
@@ -31,8 +30,7 @@ class AbstractIce(Module, strict=True):
             "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}",
         ]
         | Complex[
-            Array,
-            "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}",
+            Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim}"
         ]
     ):
         """Sample a stochastic realization of the phase shifts due to the ice
@@ -96,28 +94,61 @@ class GaussianIce(AbstractIce, strict=True):
         key: PRNGKeyArray,
         instrument_config: InstrumentConfig,
         get_rfft: bool = True,
-    ) -> Complex[
-        Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}"
-    ]:
+    ) -> (
+        Complex[
+            Array,
+            "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim//2+1}",
+        ]
+        | Complex[
+            Array, "{instrument_config.padded_y_dim} {instrument_config.padded_x_dim}"
+        ]
+    ):
         """Sample a realization of the ice phase shifts as colored gaussian noise."""
         n_pixels = instrument_config.padded_n_pixels
         frequency_grid_in_angstroms = instrument_config.padded_frequency_grid_in_angstroms
         # Compute standard deviation, scaling up by the variance by the number
         # of pixels to make the realization independent pixel-independent in real-space.
-        std = jnp.sqrt(n_pixels * self.variance_function(frequency_grid_in_angstroms))
-        ice_integrated_potential_at_exit_plane = std * jr.normal(
-            key,
-            shape=frequency_grid_in_angstroms.shape[0:-1],
-            dtype=complex,
-        ).at[0, 0].set(0.0)
-        ice_spectrum_at_exit_plane = convert_units_of_integrated_potential(
-            ice_integrated_potential_at_exit_plane,
+        # Convert its units and zero out the zero mode here, so that the complex
+        # realization is only scaled once
+        shape = frequency_grid_in_angstroms.shape[0:-1]
+        std = convert_units_of_integrated_potential(
+            jnp.broadcast_to(
+                jnp.sqrt(n_pixels * self.variance_function(frequency_grid_in_angstroms)),
+                shape,
+            ),
             instrument_config.wavelength_in_angstroms,
         )
+        ice_spectrum_at_exit_plane = std.at[0, 0].set(0.0) * jr.normal(
+            key, shape=shape, dtype=complex
+        )
 
         if get_rfft:
             return ice_spectrum_at_exit_plane
         else:
-            return fftn(
-                irfftn(ice_spectrum_at_exit_plane, s=instrument_config.padded_shape)
+            # ... expand to the full plane with hermitian symmetry, rather than
+            # an inverse real FFT followed by a complex FFT
+            return _expand_rfft_to_fft(
+                ice_spectrum_at_exit_plane, instrument_config.padded_x_dim
             )
+
+
+def _expand_rfft_to_fft(
+    rfft: Complex[Array, "y_dim x_half_dim"], x_dim: int
+) -> Complex[Array, "y_dim x_dim"]:
+    """Compute the full fourier transform of a real image from its
+    hermitian half-plane. This is equivalent to `fftn(irfftn(rfft, s))`, so
+    the self-conjugate columns are symmetrized to match `irfftn`.
+    """
+
+    def reflect(ft):
+        # ... the array at (-k_y, k_x), conjugated
+        return jnp.conj(jnp.roll(jnp.flip(ft, axis=0), 1, axis=0))
+
+    n_self_conjugate = 2 if x_dim % 2 == 0 else 1
+    self_conjugate_columns = jnp.asarray([0, -1])[:n_self_conjugate]
+    rfft = rfft.at[:, self_conjugate_columns].set(
+        0.5 * (rfft + reflect(rfft))[:, self_conjugate_columns]
+    )
+    return jnp.concatenate(
+        (rfft, reflect(rfft)[:, 1 : x_dim - x_dim // 2][:, ::-1]), axis=1
+    )
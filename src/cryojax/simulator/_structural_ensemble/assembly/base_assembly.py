@@ -79,9 +79,16 @@ class AbstractAssembly(AbstractStructuralEnsemble, strict=True):
     ) -> Float[Array, "{self.n_subcomponents} 3"]:
         """The 3D positions of each subcomponent in the lab frame,
         measured in angstroms and relative to the center of the volume."""
+        # ... the translation is in-plane, so build it once with a zero z
+        # component and add it to all positions in one broadcasted add
+        offset_x, offset_y = (
+            self.pose.offset_x_in_angstroms,
+            self.pose.offset_y_in_angstroms,
+        )
+        translation = jnp.stack([offset_x, offset_y, jnp.zeros_like(offset_x)])
         return (
             self.pose.rotate_coordinates(self.positions_in_body_frame, inverse=False)
-            + jnp.concatenate((self.pose.offset_in_angstroms, jnp.zeros(1)))[None, :]
+            + translation[None, :]
         )
 
     @cached_property
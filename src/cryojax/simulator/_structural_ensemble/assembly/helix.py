@@ -94,7 +94,10 @@ class HelicalAssembly(AbstractAssemblyWithSubunit, strict=True):
             self.twist,
             n_subunits_per_start=self.n_subunits // self.n_start,
             initial_displacement=jnp.concatenate(
-                (self.subunit.pose.offset_in_angstroms, jnp.zeros(1))
+                (
+                    self.subunit.pose.offset_in_angstroms,
+                    jnp.zeros_like(self.subunit.pose.offset_in_angstroms[:1]),
+                )
             ),
             n_start=self.n_start,
         )
@@ -197,7 +200,7 @@ def compute_helical_lattice_positions(
         compute_helix_subunit_positions_per_start, in_axes=[0, None]
     )
     # ... compute symmetry angles relating first sub-helix to all other sub-helices
-    symmetry_angles = jnp.array([2 * jnp.pi * n / n_start for n in range(n_start)])
+    symmetry_angles = 2 * jnp.pi * jnp.arange(n_start, dtype=float) / n_start
     # ... finally, get all subunit positions!
     subunit_positions = compute_helix_subunit_positions(
         symmetry_angles, subunit_positions_in_subhelix
@@ -271,7 +274,7 @@ def compute_helical_lattice_rotations(
         compute_helix_subunit_rotations_per_start, in_axes=[0, None]
     )
     # ... compute symmetry angles relating first sub-helix to all other sub-helices
-    symmetry_angles = jnp.array([2 * jnp.pi * n / n_start for n in range(n_start)])
+    symmetry_angles = 2 * jnp.pi * jnp.arange(n_start, dtype=float) / n_start
     # ... finally, get all subunit rotations!
     subunit_rotations = compute_helix_subunit_rotations(
         symmetry_angles, subunit_rotations_in_subhelix
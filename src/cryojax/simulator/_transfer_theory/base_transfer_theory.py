@@ -41,10 +41,9 @@ class AbstractTransferFunction(Module, strict=True):
         astigmatism_angle = jnp.deg2rad(self.astigmatism_angle)
         # Convert spherical abberation coefficient to angstroms
         spherical_aberration_in_angstroms = self.spherical_aberration_in_mm * 1e7
-        # Get the wavelength
-        wavelength_in_angstroms = convert_keV_to_angstroms(
-            jnp.asarray(voltage_in_kilovolts)
-        )
+        # Get the wavelength. This accepts python floats, in which case it is
+        # evaluated as a constant rather than traced
+        wavelength_in_angstroms = convert_keV_to_angstroms(voltage_in_kilovolts)
         # Compute phase shifts for CTF
         phase_shifts = compute_phase_shifts_with_spherical_aberration(
             frequency_grid_in_angstroms,
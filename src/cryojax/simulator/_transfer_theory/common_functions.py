@@ -1,8 +1,6 @@
 import jax.numpy as jnp
 from jaxtyping import Array, Float
 
-from ...coordinates import cartesian_to_polar
-
 
 # Not currently public API
 def compute_phase_shifts_with_spherical_aberration(
@@ -13,18 +11,27 @@ def compute_phase_shifts_with_spherical_aberration(
     wavelength_in_angstroms: Float[Array, ""],
     spherical_aberration_in_angstroms: Float[Array, ""],
 ) -> Float[Array, "y_dim x_dim"]:
-    k_sqr, azimuth = cartesian_to_polar(frequency_grid_in_angstroms, square=True)
-    defocus = defocus_in_angstroms + 0.5 * astigmatism_in_angstroms * jnp.cos(
-        2.0 * (azimuth - astigmatism_angle)
-    )
-    defocus_phase_shifts = -0.5 * defocus * wavelength_in_angstroms * k_sqr
-    aberration_phase_shifts = (
-        0.25
-        * spherical_aberration_in_angstroms
-        * (wavelength_in_angstroms**3)
-        * (k_sqr**2)
+    # Work with the components of the frequency grid directly, rather than
+    # converting to polar coordinates with an arctangent. With the azimuth
+    # measured from the y-axis as in `cartesian_to_polar`, the astigmatic term
+    # is |k|^2 cos(2 (azimuth - angle)) = (k_y^2 - k_x^2) cos(2 angle) +
+    # 2 k_x k_y sin(2 angle)
+    # These only depend on the frequency grid, so under `jax.vmap` over the CTF
+    # parameters they are not batched and are computed once
+    k_x, k_y = frequency_grid_in_angstroms[..., 0], frequency_grid_in_angstroms[..., 1]
+    k_sqr = k_x * k_x + k_y * k_y
+    # Fold the scalar factors into the coefficients of each term, so that the
+    # frequency grid is multiplied by as few constants as possible
+    defocus_coefficient = -jnp.pi * wavelength_in_angstroms
+    astigmatism_coefficient = defocus_coefficient * astigmatism_in_angstroms
+    phase_shifts = (
+        (defocus_coefficient * defocus_in_angstroms) * k_sqr
+        + (0.5 * astigmatism_coefficient * jnp.cos(2.0 * astigmatism_angle))
+        * (k_y * k_y - k_x * k_x)
+        + (astigmatism_coefficient * jnp.sin(2.0 * astigmatism_angle)) * (k_x * k_y)
+        + (0.5 * jnp.pi * spherical_aberration_in_angstroms * wavelength_in_angstroms**3)
+        * (k_sqr * k_sqr)
     )
-    phase_shifts = (2 * jnp.pi) * (defocus_phase_shifts + aberration_phase_shifts)
 
     return phase_shifts
 
@@ -163,6 +163,10 @@ class ContrastTransferTheory(eqx.Module, strict=True):
                 frequency_grid,
                 voltage_in_kilovolts=instrument_config.voltage_in_kilovolts,
             )
+            if self.envelope is not None:
+                # ... combine with the envelope, so that the object spectrum
+                # is only multiplied once
+                ctf_array *= self.envelope(frequency_grid)
             # ... compute the contrast as the CTF multiplied by the exit plane
             # phase shifts
             contrast_spectrum_at_detector_plane = (
@@ -181,8 +185,8 @@ class ContrastTransferTheory(eqx.Module, strict=True):
                 self.ctf.amplitude_contrast_ratio,
                 instrument_config,
             )
-        if self.envelope is not None:
-            contrast_spectrum_at_detector_plane *= self.envelope(frequency_grid)
+            if self.envelope is not None:
+                contrast_spectrum_at_detector_plane *= self.envelope(frequency_grid)
 
         return contrast_spectrum_at_detector_plane
 
@@ -1,4 +1,5 @@
 import equinox as eqx
+import jax
 import jax.numpy as jnp
 from jaxtyping import Array, Complex, Float
 
@@ -58,6 +59,23 @@ class WaveTransferFunction(AbstractTransferFunction, strict=True):
         frequency_grid_in_angstroms: Float[Array, "y_dim x_dim 2"],
         voltage_in_kilovolts: Float[Array, ""] | float,
     ) -> Complex[Array, "y_dim x_dim"]:
+        # Compute the WTF from its phase shifts
+        return jnp.exp(
+            -1.0j
+            * self.compute_total_phase_shifts(
+                frequency_grid_in_angstroms, voltage_in_kilovolts
+            )
+        )
+
+    def compute_total_phase_shifts(
+        self,
+        frequency_grid_in_angstroms: Float[Array, "y_dim x_dim 2"],
+        voltage_in_kilovolts: Float[Array, ""] | float,
+    ) -> Float[Array, "y_dim x_dim"]:
+        """Compute the phase shifts $\\chi(\\boldsymbol{q})$ of the wave transfer
+        function $\\exp(-i \\chi(\\boldsymbol{q}))$, including the amplitude
+        contrast and additional phase shift in the zero mode.
+        """
         # Compute aberration phase shifts
         aberration_phase_shifts = self.compute_aberration_phase_shifts(
             frequency_grid_in_angstroms, voltage_in_kilovolts=voltage_in_kilovolts
@@ -69,13 +87,10 @@ class WaveTransferFunction(AbstractTransferFunction, strict=True):
                 self.amplitude_contrast_ratio
             )
         )
-        # Compute the WTF, correcting for the amplitude contrast and additional phase
-        # shift in the zero mode
-        return jnp.exp(
-            -1.0j
-            * aberration_phase_shifts.at[0, 0].add(
-                phase_shift + amplitude_contrast_phase_shift
-            )
+        # Correct for the amplitude contrast and additional phase shift in the
+        # zero mode
+        return aberration_phase_shifts.at[0, 0].add(
+            phase_shift + amplitude_contrast_phase_shift
         )
 
 
@@ -107,15 +122,28 @@ class WaveTransferTheory(eqx.Module, strict=True):
     ]:
         """Apply the wave transfer function to the wavefunction in the exit plane."""
         frequency_grid = instrument_config.padded_full_frequency_grid_in_angstroms
-        # Compute the wave transfer function
-        wtf_array = self.wtf(
+        # Compute the phase shifts of the wave transfer function
+        phase_shifts = self.wtf.compute_total_phase_shifts(
             frequency_grid,
             voltage_in_kilovolts=instrument_config.voltage_in_kilovolts,
         )
-        # ... compute the contrast as the CTF multiplied by the exit plane
-        # phase shifts
-        wavefunction_spectrum_at_detector_plane = (
-            wtf_array * wavefunction_spectrum_at_exit_plane
+        # ... and apply them to the wavefunction in the exit plane, without
+        # storing the wave transfer function as an intermediate
+        wavefunction_spectrum_at_detector_plane = _apply_phase_shifts(
+            -phase_shifts, wavefunction_spectrum_at_exit_plane
         )
 
         return wavefunction_spectrum_at_detector_plane
+
+
+def _apply_phase_shifts(
+    phase_shifts: Float[Array, "y_dim x_dim"],
+    spectrum: Complex[Array, "y_dim x_dim"],
+) -> Complex[Array, "y_dim x_dim"]:
+    # Multiply by exp(i * phase_shifts) in terms of real and imaginary parts,
+    # so that the complex exponential is fused with the multiplication
+    cos, sin = jnp.cos(phase_shifts), jnp.sin(phase_shifts)
+    return jax.lax.complex(
+        cos * spectrum.real - sin * spectrum.imag,
+        cos * spectrum.imag + sin * spectrum.real,
+    )
@@ -4,6 +4,7 @@ per-leaf behavior for pytrees.
 """
 
 from ._batched_loop import batched_map as batched_map, batched_scan as batched_scan
+from ._compilation_cache import enable_compilation_cache as enable_compilation_cache
 from ._filter_specs import get_filter_spec as get_filter_spec
 from ._transforms import (
     AbstractPyTreeTransform as AbstractPyTreeTransform,
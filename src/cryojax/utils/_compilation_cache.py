@@ -0,0 +1,45 @@
+import os
+from typing import Optional
+
+import jax
+
+
+def enable_compilation_cache(
+    cache_dir: Optional[str] = None,
+    *,
+    min_compile_time_in_seconds: float = 1.0,
+):
+    """Enable JAX's persistent compilation cache, so that jitted imaging
+    pipelines and likelihoods compiled in one session are loaded from disk
+    in the next, rather than compiled again.
+
+    This sets global JAX configuration, so it should be called once at the
+    start of a program.
+
+    **Arguments:**
+
+    - `cache_dir`:
+        The directory in which to store compiled programs. If not given, use
+        the environment variable `CRYOJAX_COMPILATION_CACHE_DIR` if it is set
+        and `~/.cache/cryojax/jit` otherwise.
+    - `min_compile_time_in_seconds`:
+        Only cache programs that take at least this long to compile.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(
+            "CRYOJAX_COMPILATION_CACHE_DIR",
+            os.path.join("~", ".cache", "cryojax", "jit"),
+        )
+    jax.config.update("jax_compilation_cache_dir", os.path.expanduser(cache_dir))
+    jax.config.update(
+        "jax_persistent_cache_min_compile_time_secs", min_compile_time_in_seconds
+    )
+    jax.config.update("jax_persistent_cache_min_entry_size_bytes", 0)
+    # ... the cache is initialized at the first compilation, which may have
+    # already happened. If so, reset it so that it is initialized with these
+    # settings at the next compilation. This is a private JAX API, so only
+    # import it here and check that it exists
+    from jax.experimental.compilation_cache import compilation_cache
+
+    if hasattr(compilation_cache, "reset_cache"):
+        compilation_cache.reset_cache()
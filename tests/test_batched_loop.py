@@ -0,0 +1,31 @@
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from cryojax.utils import batched_scan
+
+
+jax.config.update("jax_enable_x64", True)
+
+
+@pytest.mark.parametrize("batch_size", (1, 3, 4, 10))
+def test_batched_scan_vs_scan_agreement(batch_size):
+    # ... for `batch_size = 3` and `4`, the length is not a multiple of the
+    # batch size, so the remainder batch must continue from the carry
+    xs = jnp.asarray(np.random.randn(10))
+
+    def cumulative_sum(carry, x):
+        carry = carry + x
+        return carry, carry
+
+    def batched_cumulative_sum(carry, x):
+        ys = carry + jnp.cumsum(x)
+        return ys[-1], ys
+
+    carry, ys = jax.lax.scan(cumulative_sum, jnp.asarray(0.0), xs)
+    batched_carry, batched_ys = batched_scan(
+        batched_cumulative_sum, jnp.asarray(0.0), xs, batch_size=batch_size
+    )
+    np.testing.assert_allclose(batched_carry, carry)
+    np.testing.assert_allclose(batched_ys, ys)
@@ -0,0 +1,36 @@
+import os
+
+import jax
+import jax.numpy as jnp
+import pytest
+from jax.experimental.compilation_cache import compilation_cache
+
+from cryojax.utils import enable_compilation_cache
+
+
+@pytest.fixture
+def restore_compilation_cache_config():
+    names = [
+        "jax_compilation_cache_dir",
+        "jax_persistent_cache_min_compile_time_secs",
+        "jax_persistent_cache_min_entry_size_bytes",
+    ]
+    values = {name: getattr(jax.config, name) for name in names}
+    yield
+    for name, value in values.items():
+        jax.config.update(name, value)
+    if hasattr(compilation_cache, "reset_cache"):
+        compilation_cache.reset_cache()
+
+
+def test_enable_compilation_cache(tmp_path, restore_compilation_cache_config):
+    cache_dir = str(tmp_path / "jit")
+    enable_compilation_cache(cache_dir, min_compile_time_in_seconds=0.0)
+    assert jax.config.jax_compilation_cache_dir == cache_dir
+
+    @jax.jit
+    def f(x):
+        return jnp.sin(x) * jnp.cos(x) + 0.123456789
+
+    f(jnp.arange(17.0)).block_until_ready()
+    assert len(os.listdir(cache_dir)) > 0
@@ -1,7 +1,10 @@
+import jax.random as jr
 import numpy as np
 import pytest
 
 import cryojax.simulator as cxs
+from cryojax.image import rfftn
+from cryojax.image.operators import CircularCosineMask, Constant
 from cryojax.inference import distributions as dist
 
 
@@ -20,3 +23,74 @@ def test_simulate_signal_from_gaussian_distributions(
     imaging_pipeline = cxs.ContrastImagingPipeline(instrument_config, scattering_theory)
     distribution = cls(imaging_pipeline)
     np.testing.assert_allclose(imaging_pipeline.render(), distribution.compute_signal())
+
+
+def test_log_likelihood_of_independent_gaussian_pixels(theory, config):
+    imaging_pipeline = cxs.ContrastImagingPipeline(config, theory)
+    distribution = dist.IndependentGaussianPixels(imaging_pipeline, variance=2.0)
+    signal = distribution.compute_signal()
+    observed_1, observed_2 = (distribution.sample(jr.key(i)) for i in range(2))
+    # Compare differences of log-likelihoods, which do not depend on the
+    # normalization constant
+    np.testing.assert_allclose(
+        distribution.log_likelihood(observed_1) - distribution.log_likelihood(observed_2),
+        np.sum((signal - observed_2) ** 2 - (signal - observed_1) ** 2) / (2 * 2.0),
+        rtol=1e-6,
+    )
+
+
+def test_log_likelihood_of_independent_gaussian_fourier_modes(
+    theory, pixel_size, voltage_in_kilovolts
+):
+    # ... use an odd number of columns, so that every mode in the half-spectrum
+    # other than the first column has a distinct Hermitian partner
+    config = cxs.InstrumentConfig((16, 15), pixel_size, voltage_in_kilovolts)
+    imaging_pipeline = cxs.ContrastImagingPipeline(config, theory)
+    variance, n_pixels = 2.0, config.n_pixels
+    distribution = dist.IndependentGaussianFourierModes(
+        imaging_pipeline, variance_function=Constant(variance)
+    )
+    signal = distribution.compute_signal(get_real=True)
+    observed = signal + np.sqrt(variance) * np.random.randn(*config.shape)
+    # By Parseval's theorem, the sum over the half-spectrum without the zero
+    # mode, doubling the modes with a Hermitian partner, is a real-space sum
+    # over the residuals with their mean removed
+    residuals = signal - observed
+    residuals = residuals - np.mean(residuals)
+    expected_log_likelihood = (
+        -np.sum(residuals**2) / (2 * variance)
+        + (n_pixels - 1) * np.log(2 * np.pi * n_pixels * variance) / 2
+    ) / n_pixels
+    np.testing.assert_allclose(
+        distribution.log_likelihood(rfftn(observed)), expected_log_likelihood, rtol=1e-10
+    )
+
+
+@pytest.mark.parametrize(
+    "cls", [dist.IndependentGaussianPixels, dist.IndependentGaussianFourierModes]
+)
+def test_sample_is_signal_plus_noise(cls, theory, config):
+    mask = CircularCosineMask(config.coordinate_grid_in_angstroms, 20.0, 5.0)
+    imaging_pipeline = cxs.ContrastImagingPipeline(config, theory, mask=mask)
+    distribution = cls(imaging_pipeline, signal_scale_factor=2.0)
+    rng_key = jr.key(0)
+    for get_real in (True, False):
+        np.testing.assert_allclose(
+            distribution.sample(rng_key, get_real=get_real),
+            distribution.compute_signal(get_real=get_real)
+            + distribution.compute_noise(rng_key, get_real=get_real),
+            atol=1e-10,
+        )
+
+
+@pytest.mark.parametrize(
+    "cls", [dist.IndependentGaussianPixels, dist.IndependentGaussianFourierModes]
+)
+def test_normalized_signal_in_fourier_space(cls, theory, config):
+    imaging_pipeline = cxs.ContrastImagingPipeline(config, theory)
+    distribution = cls(imaging_pipeline, is_signal_normalized=True)
+    np.testing.assert_allclose(
+        distribution.compute_signal(get_real=False),
+        rfftn(distribution.compute_signal(get_real=True)),
+        atol=1e-8,
+    )
@@ -1,9 +1,11 @@
 import jax
 import jax.numpy as jnp
+import jax.random as jr
 import numpy as np
 import pytest
 
-from cryojax.image import fftn, ifftn
+import cryojax.simulator as cs
+from cryojax.image import compute_fast_fft_length, fftn, ifftn, irfftn
 
 
 jax.config.update("jax_enable_x64", True)
@@ -35,3 +37,26 @@ def test_fft(model, request):
     np.testing.assert_allclose(
         fftn(image)[0, 0], fftn(ifftn(fftn(image)).real)[0, 0], atol=1e-12
     )
+
+
+@pytest.mark.parametrize(
+    "n, fast_length", [(1, 1), (7, 8), (71, 72), (97, 100), (257, 270), (1000, 1000)]
+)
+def test_compute_fast_fft_length(n, fast_length):
+    assert compute_fast_fft_length(n) == fast_length
+
+
+def test_pad_to_fast_fft_shape(pixel_size):
+    config = cs.InstrumentConfig(
+        (65, 66), pixel_size, 300.0, pad_scale=1.1, pad_to_fast_fft_shape=True
+    )
+    assert config.padded_shape == (72, 72)
+
+
+@pytest.mark.parametrize("shape", [(10, 10), (10, 11), (11, 10), (11, 11)])
+def test_full_ice_spectrum_is_hermitian_expansion(shape, solvent):
+    config = cs.InstrumentConfig(shape, 1.0, 300.0)
+    key = jr.key(0)
+    ice_rfft = solvent.sample_ice_spectrum(key, config, get_rfft=True)
+    ice_fft = solvent.sample_ice_spectrum(key, config, get_rfft=False)
+    np.testing.assert_allclose(ice_fft, fftn(irfftn(ice_rfft, s=shape)), atol=1e-12)
@@ -101,3 +101,13 @@ def test_run_grid_search(batch_size, dim, offset, variance):
     solution = cxi.run_grid_search(cost_fn, method, grid, (variance, offset))
     np.testing.assert_allclose(solution.state.current_minimum_eval, true_min_eval)
     np.testing.assert_allclose(solution.value, true_min_pos)
+
+
+@pytest.mark.parametrize("batch_size", [3, 4, 7])
+def test_run_grid_search_with_ragged_batch(batch_size):
+    # The minimum is at the last grid point, which is in the final ragged batch
+    grid = jnp.arange(10, dtype=float)
+    method = cxi.MinimumSearchMethod(batch_size=batch_size)
+    solution = cxi.run_grid_search(lambda x, args: -x, method, grid, None)
+    assert solution.state.current_best_raveled_index == 9
+    np.testing.assert_allclose(solution.value, 9.0)
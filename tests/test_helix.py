@@ -6,6 +6,7 @@ import pytest
 
 import cryojax.simulator as cs
 from cryojax.image import irfftn, normalize_image
+from cryojax.image.operators import FourierGaussian
 from cryojax.io import read_array_with_spacing_from_mrc
 
 
@@ -88,6 +89,53 @@ def test_superposition_pipeline_with_conformation(sample_subunit_mrc_path, confi
     _ = pipeline.render(jax.random.PRNGKey(0))
 
 
+@pytest.mark.parametrize("batch_size", (1, 4))
+def test_superposition_batched_vs_vmapped_agreement(
+    sample_subunit_mrc_path, config, batch_size
+):
+    helix = build_helix(sample_subunit_mrc_path, 1)
+    projection_method = cs.FourierSliceExtraction()
+    transfer_theory = cs.ContrastTransferTheory(cs.ContrastTransferFunction())
+    theory = cs.LinearSuperpositionScatteringTheory(
+        helix, projection_method, transfer_theory
+    )
+    batched_theory = cs.LinearSuperpositionScatteringTheory(
+        helix, projection_method, transfer_theory, batch_size=batch_size
+    )
+    np.testing.assert_allclose(
+        theory.compute_object_spectrum_at_exit_plane(config),
+        batched_theory.compute_object_spectrum_at_exit_plane(config),
+        atol=1e-8,
+    )
+    np.testing.assert_allclose(
+        theory.compute_contrast_spectrum_at_detector_plane(config),
+        batched_theory.compute_contrast_spectrum_at_detector_plane(config),
+        atol=1e-8,
+    )
+
+
+def test_superposition_envelope_agreement(sample_subunit_mrc_path, config):
+    helix = build_helix(sample_subunit_mrc_path, 1)
+    projection_method = cs.FourierSliceExtraction()
+    envelope = FourierGaussian(b_factor=100.0)
+    theory = cs.LinearSuperpositionScatteringTheory(
+        helix,
+        projection_method,
+        cs.ContrastTransferTheory(cs.ContrastTransferFunction()),
+    )
+    theory_with_envelope = cs.LinearSuperpositionScatteringTheory(
+        helix,
+        projection_method,
+        cs.ContrastTransferTheory(cs.ContrastTransferFunction(), envelope),
+    )
+    np.testing.assert_allclose(
+        envelope(config.padded_frequency_grid_in_angstroms)
+        * theory.compute_contrast_spectrum_at_detector_plane(config),
+        theory_with_envelope.compute_contrast_spectrum_at_detector_plane(config),
+        atol=1e-8,
+    )
+
+
 @pytest.mark.parametrize(
     "rotation_angle, n_subunits_per_start",
     [(360.0 / 6, 1), (2 * 360.0 / 6, 1), (360.0 / 6, 2)],
@@ -121,6 +121,98 @@ def test_peng_vs_gmm_agreement(sample_pdb_path):
     np.testing.assert_allclose(projection_gmm, projection_peng)
 
 
+def test_real_vs_fourier_space_projection_agreement(sample_pdb_path):
+    """Test that evaluating projections in real and fourier space agree
+    when the gaussians are well-sampled.
+    """
+    atom_positions, atom_identities = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    # ... add a B-factor so that the real-space projection does not alias
+    b_factors = np.full(atom_positions.shape[0], 60.0)
+    atom_potential = PengAtomicPotential(atom_positions, atom_identities, b_factors)
+    instrument_config = InstrumentConfig(
+        shape=(64, 63),
+        pixel_size=0.5,
+        voltage_in_kilovolts=300.0,
+    )
+    # Compute projections
+    projection_in_real_space = (
+        GaussianMixtureProjection().compute_fourier_integrated_potential(
+            atom_potential, instrument_config
+        )
+    )
+    projection_in_fourier_space = GaussianMixtureProjection(
+        evaluate_in_fourier_space=True
+    ).compute_fourier_integrated_potential(atom_potential, instrument_config)
+
+    np.testing.assert_allclose(
+        projection_in_real_space,
+        projection_in_fourier_space,
+        atol=1e-6 * np.abs(projection_in_real_space).max(),
+    )
+
+
+@pytest.mark.parametrize("upsampling_factor", (None, 2))
+def test_low_precision_intermediates_projection_agreement(
+    sample_pdb_path, upsampling_factor
+):
+    atom_positions, atom_identities = read_atoms_from_pdb(sample_pdb_path)
+    atom_potential = PengAtomicPotential(atom_positions, atom_identities)
+    atom_potential = GaussianMixtureAtomicPotential(
+        atom_potential.atom_positions,
+        atom_potential.scattering_factor_a,
+        atom_potential.scattering_factor_b,
+    )
+    instrument_config = InstrumentConfig(
+        shape=(64, 63),
+        pixel_size=0.5,
+        voltage_in_kilovolts=300.0,
+    )
+    # Compute projections
+    projection = irfftn(
+        GaussianMixtureProjection(
+            upsampling_factor=upsampling_factor
+        ).compute_fourier_integrated_potential(atom_potential, instrument_config),
+        s=instrument_config.padded_shape,
+    )
+    projection_with_bfloat16 = irfftn(
+        GaussianMixtureProjection(
+            upsampling_factor=upsampling_factor, intermediate_dtype=jnp.bfloat16
+        ).compute_fourier_integrated_potential(atom_potential, instrument_config),
+        s=instrument_config.padded_shape,
+    )
+    assert projection_with_bfloat16.dtype == projection.dtype
+    np.testing.assert_allclose(
+        projection, projection_with_bfloat16, atol=1e-2 * np.abs(projection).max()
+    )
+
+
+@pytest.mark.parametrize("evaluate_in_fourier_space", (False, True))
+def test_atom_groups_vs_all_atoms_projection_agreement(
+    sample_pdb_path, evaluate_in_fourier_space
+):
+    atom_positions, atom_identities = read_atoms_from_pdb(sample_pdb_path)
+    atom_potential = PengAtomicPotential(atom_positions, atom_identities)
+    instrument_config = InstrumentConfig(
+        shape=(64, 63),
+        pixel_size=0.5,
+        voltage_in_kilovolts=300.0,
+    )
+    # Compute projections
+    projection = GaussianMixtureProjection(
+        evaluate_in_fourier_space=evaluate_in_fourier_space
+    ).compute_fourier_integrated_potential(atom_potential, instrument_config)
+    projection_with_atom_groups = GaussianMixtureProjection(
+        evaluate_in_fourier_space=evaluate_in_fourier_space, atom_groups_in_series=3
+    ).compute_fourier_integrated_potential(atom_potential, instrument_config)
+
+    np.testing.assert_allclose(
+        projection,
+        projection_with_atom_groups,
+        atol=1e-8 * np.abs(projection).max(),
+    )
+
+
 class TestBuildRealSpaceVoxelsFromAtoms:
     @pytest.mark.parametrize("largest_atom", range(0, 3))
     def test_maxima_are_in_right_positions(self, toy_gaussian_cloud, largest_atom):
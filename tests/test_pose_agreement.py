@@ -1,3 +1,4 @@
+import equinox as eqx
 import jax.numpy as jnp
 import numpy as np
 import pytest
@@ -67,3 +68,119 @@ def test_euler_angle_conversion(phi, theta, psi):
             (converted_pose.view_phi, converted_pose.view_theta, converted_pose.view_psi)
         ),
     )
+
+
+@pytest.mark.parametrize("shape", [(20, 3), (4, 5, 6, 3)])
+def test_rotate_coordinates_agrees_with_rotation_apply(shape):
+    pose = cs.EulerAnglePose(view_phi=10.0, view_theta=40.0, view_psi=-70.0)
+    coordinates = jnp.asarray(np.random.randn(*shape))
+    coordinate_list = coordinates.reshape((-1, 3))
+    for inverse in (False, True):
+        rotation = pose.rotation.inverse() if inverse else pose.rotation
+        np.testing.assert_allclose(
+            pose.rotate_coordinates(coordinates, inverse=inverse).reshape((-1, 3)),
+            jnp.stack([rotation.apply(r) for r in coordinate_list]),
+            atol=1e-6,
+        )
+
+
+@pytest.mark.parametrize(
+    "phi, theta, psi",
+    [(2.0, 15.0, -40.0), (10.0, 90.0, 170.0), (-120.0, 40.0, -80.0), (0.0, 0.0, 0.0)],
+)
+def test_euler_angle_rotation_agrees_with_composed_rotations(phi, theta, psi):
+    pose = cs.EulerAnglePose(view_phi=phi, view_theta=theta, view_psi=psi)
+    phi, theta, psi = jnp.deg2rad(jnp.asarray((phi, theta, psi)))
+    rotation = (
+        SO3.from_z_radians(psi) @ SO3.from_y_radians(theta) @ SO3.from_z_radians(phi)
+    )
+    np.testing.assert_allclose(pose.rotation.wxyz, rotation.wxyz, atol=1e-6)
+
+
+@pytest.mark.parametrize("shape", [(20, 3), (4, 5, 6, 3)])
+def test_rotate_coordinates_with_batched_pose(shape):
+    make_pose = lambda phi, theta, psi: cs.EulerAnglePose(
+        view_phi=phi, view_theta=theta, view_psi=psi
+    )
+    angles = jnp.asarray(np.random.uniform(-180.0, 180.0, size=(3, 5)))
+    poses = eqx.filter_vmap(make_pose)(*angles)
+    coordinates = jnp.asarray(np.random.randn(*shape))
+    for inverse in (False, True):
+        np.testing.assert_allclose(
+            poses.rotate_coordinates_batched(coordinates, inverse=inverse),
+            eqx.filter_vmap(
+                lambda pose: pose.rotate_coordinates(coordinates, inverse=inverse)
+            )(poses),
+            atol=1e-12,
+        )
+
+
+@pytest.mark.parametrize("shape", [(20, 3), (4, 5, 6, 3)])
+def test_rotate_coordinates_with_batched_angles_only(shape):
+    # ... only the angles are batched, and the offsets are scalars
+    make_pose = lambda phi, theta, psi: cs.EulerAnglePose(
+        offset_x_in_angstroms=1.0, view_phi=phi, view_theta=theta, view_psi=psi
+    )
+    angles = jnp.asarray(np.random.uniform(-180.0, 180.0, size=(3, 5)))
+    poses = eqx.tree_at(
+        lambda pose: (pose.view_phi, pose.view_theta, pose.view_psi),
+        make_pose(0.0, 0.0, 0.0),
+        tuple(angles),
+    )
+    coordinates = jnp.asarray(np.random.randn(*shape))
+    rotated_coordinates = poses.rotate_coordinates_batched(coordinates)
+    assert rotated_coordinates.shape == (5, *shape)
+    for i in range(5):
+        np.testing.assert_allclose(
+            rotated_coordinates[i],
+            make_pose(*angles[:, i]).rotate_coordinates(coordinates),
+            atol=1e-12,
+        )
+
+
+@pytest.mark.parametrize(
+    "pose",
+    [
+        cs.EulerAnglePose(view_phi=30.0, view_theta=60.0, view_psi=-45.0),
+        cs.QuaternionPose(wxyz=(0.5, 0.1, -0.3, 0.8)),
+        cs.AxisAnglePose(euler_vector=(20.0, -10.0, 45.0)),
+    ],
+)
+def test_rotate_coordinates_with_batched_offsets_only(pose):
+    # ... only the offsets are batched, so the rotation is not
+    offsets = jnp.asarray(np.random.randn(2, 5))
+    poses = eqx.tree_at(
+        lambda pose: (pose.offset_x_in_angstroms, pose.offset_y_in_angstroms),
+        pose,
+        tuple(offsets),
+    )
+    coordinates = jnp.asarray(np.random.randn(20, 3))
+    rotated_coordinates = poses.rotate_coordinates_batched(coordinates)
+    assert rotated_coordinates.shape == coordinates.shape
+    np.testing.assert_allclose(
+        rotated_coordinates, pose.rotate_coordinates(coordinates), atol=1e-12
+    )
+
+
+def test_rotate_coordinates_with_multiple_batch_dimensions():
+    wxyz = jnp.asarray(np.random.randn(2, 3, 4))
+    poses = cs.QuaternionPose(wxyz=wxyz[0, 0])
+    poses = eqx.tree_at(lambda pose: pose.wxyz, poses, wxyz)
+    coordinates = jnp.asarray(np.random.randn(20, 3))
+    rotated_coordinates = poses.rotate_coordinates_batched(coordinates, inverse=True)
+    assert rotated_coordinates.shape == (2, 3, 20, 3)
+    for i, j in np.ndindex(2, 3):
+        np.testing.assert_allclose(
+            rotated_coordinates[i, j],
+            cs.QuaternionPose(wxyz=wxyz[i, j]).rotate_coordinates(
+                coordinates, inverse=True
+            ),
+            atol=1e-12,
+        )
+
+
+def test_shifts_follow_frequency_grid_precision():
+    pose = cs.EulerAnglePose(offset_x_in_angstroms=1.5, offset_y_in_angstroms=-2.0)
+    for dtype, complex_dtype in ((jnp.float32, jnp.complex64), (float, complex)):
+        frequency_grid = jnp.ones((4, 3, 2), dtype=dtype)
+        assert pose.compute_shifts(frequency_grid).dtype == complex_dtype
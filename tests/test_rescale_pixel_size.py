@@ -1,8 +1,19 @@
+import equinox as eqx
+import jax
+import jax.numpy as jnp
 import jax.random as jr
 import numpy as np
 import pytest
 
-from cryojax.image import downsample_with_fourier_cropping
+import cryojax.simulator as cs
+from cryojax.coordinates import make_coordinate_grid
+from cryojax.image import (
+    downsample_to_shape_with_fourier_cropping,
+    downsample_with_fourier_cropping,
+    maybe_rescale_pixel_size,
+    rescale_pixel_size_in_fourier_space,
+    rfftn,
+)
 
 
 @pytest.mark.parametrize("downsampling_factor", [1.0, 2.0, 4.0])
@@ -11,3 +22,87 @@ def test_rescale_by_downsampling_preserves_sum(downsampling_factor):
     random = 2.0 + 1.0 * jr.normal(rng_key, (100, 100))
     downsampled_random = downsample_with_fourier_cropping(random, downsampling_factor)
     np.testing.assert_allclose(random.sum(), downsampled_random.sum())
+
+
+@pytest.mark.parametrize(
+    "shape, downsampled_shape",
+    [((100, 100), (50, 50)), ((99, 98), (49, 51)), ((20, 21, 22), (10, 11, 12))],
+)
+def test_downsample_real_vs_complex_fourier_cropping(shape, downsampled_shape):
+    rng_key = jr.PRNGKey(seed=1234)
+    random = jr.normal(rng_key, shape)
+    np.testing.assert_allclose(
+        downsample_to_shape_with_fourier_cropping(
+            random, downsampled_shape, get_real=False
+        ),
+        downsample_to_shape_with_fourier_cropping(
+            random.astype(complex), downsampled_shape, get_real=False
+        ),
+        atol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("new_pixel_size", [1.0, 1.2])
+def test_maybe_rescale_pixel_size_with_and_without_jit(new_pixel_size):
+    rng_key = jr.PRNGKey(seed=1234)
+    fourier_image = rfftn(jr.normal(rng_key, (64, 64)))
+    maybe_rescale = lambda current_pixel_size, new_pixel_size: (
+        maybe_rescale_pixel_size(
+            fourier_image,
+            current_pixel_size,
+            new_pixel_size,
+            is_real=False,
+            shape_in_real_space=(64, 64),
+        )
+    )
+    current_pixel_size, new_pixel_size = jnp.asarray(1.0), jnp.asarray(new_pixel_size)
+    np.testing.assert_allclose(
+        maybe_rescale(current_pixel_size, new_pixel_size),
+        jax.jit(maybe_rescale)(current_pixel_size, new_pixel_size),
+        atol=1e-3,
+    )
+
+
+@pytest.mark.parametrize(
+    "shape,new_pixel_size", [((64, 64), 0.8), ((64, 64), 1.25), ((63, 65), 1.25)]
+)
+def test_rescale_pixel_size_in_fourier_space(shape, new_pixel_size):
+    def gaussian(coordinate_grid):
+        return jnp.exp(
+            -jnp.sum((coordinate_grid - jnp.asarray([3.0, -2.0])) ** 2, axis=-1)
+            / (2 * 4.0**2)
+        )
+
+    fourier_image = rfftn(gaussian(make_coordinate_grid(shape, 1.0)))
+    rescaled_fourier_image = rescale_pixel_size_in_fourier_space(
+        fourier_image, jnp.asarray(1.0), jnp.asarray(new_pixel_size)
+    )
+    expected_fourier_image = rfftn(gaussian(make_coordinate_grid(shape, new_pixel_size)))
+    np.testing.assert_allclose(
+        rescaled_fourier_image,
+        expected_fourier_image,
+        atol=1e-2 * np.abs(expected_fourier_image).max(),
+    )
+
+
+def test_pixel_size_check_with_and_without_jit():
+    rng_key = jr.PRNGKey(seed=1234)
+    potential = cs.FourierVoxelGridPotential.from_real_voxel_grid(
+        jr.normal(rng_key, (32, 32, 32)), voxel_size=1.0
+    )
+    integrator = cs.FourierSliceExtraction(pixel_rescaling_method=None)
+    compute_integrated_potential = lambda potential, config: (
+        integrator.compute_fourier_integrated_potential(potential, config)
+    )
+    # Agreeing pixel sizes pass the check with and without jit
+    config = cs.InstrumentConfig((32, 32), 1.0, voltage_in_kilovolts=300.0)
+    np.testing.assert_allclose(
+        compute_integrated_potential(potential, config),
+        eqx.filter_jit(compute_integrated_potential)(potential, config),
+    )
+    # ... otherwise, the check fails at trace time or at runtime
+    config = cs.InstrumentConfig((32, 32), 2.0, voltage_in_kilovolts=300.0)
+    with pytest.raises(ValueError):
+        compute_integrated_potential(potential, config)
+    with pytest.raises(eqx.EquinoxRuntimeError):
+        eqx.filter_jit(compute_integrated_potential)(potential, config)
@@ -1,3 +1,4 @@
+import equinox as eqx
 import jax
 import numpy as np
 import pytest
@@ -58,3 +59,15 @@ def test_even_vs_odd_image_shape(shape, sample_mrc_path, pixel_size):
         pipeline_control.render(),
         atol=1e-4,
     )
+
+
+@pytest.mark.parametrize("padded_shape", [None, (80, 81)])
+def test_shapes_are_static(padded_shape, pixel_size):
+    config = cs.InstrumentConfig(
+        (65, 66), pixel_size, 300.0, padded_shape=padded_shape, pad_scale=1.1
+    )
+    # ... shapes are not traced under `equinox.filter_jit`
+    shape, padded_shape = eqx.filter_jit(
+        lambda config: (config.shape, config.padded_shape)
+    )(config)
+    assert shape == config.shape and padded_shape == config.padded_shape
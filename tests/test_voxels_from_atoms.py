@@ -1,3 +1,4 @@
+import equinox as eqx
 import jax
 import jax.numpy as jnp
 import numpy as np
@@ -10,9 +11,10 @@ from cryojax.image import downsample_with_fourier_cropping
 
 with install_import_hook("cryojax", "typeguard.typechecked"):
     from cryojax.coordinates import make_coordinate_grid
-    from cryojax.image import ifftn
+    from cryojax.image import fftn, ifftn
     from cryojax.io import read_atoms_from_pdb
     from cryojax.simulator import (
+        EulerAnglePose,
         FourierVoxelGridPotential,
         GaussianMixtureAtomicPotential,
         PengAtomicPotential,
@@ -88,7 +90,7 @@ def test_downsampled_voxel_potential_agreement(sample_pdb_path):
 
 @pytest.mark.parametrize(
     "z_planes_in_parallel,atom_groups_in_series",
-    ((1, 1), (2, 1), (3, 1), (1, 2), (1, 3), (2, 2)),
+    ((1, 1), (2, 1), (3, 1), (1, 2), (1, 3), (2, 2), (128, 1)),
 )
 def test_z_plane_batched_vs_non_batched_loop_agreement(
     sample_pdb_path, z_planes_in_parallel, atom_groups_in_series
@@ -111,6 +113,239 @@ def test_z_plane_batched_vs_non_batched_loop_agreement(
     np.testing.assert_allclose(voxels, voxels_with_batching)
 
 
+@pytest.mark.parametrize(
+    "shape,atom_groups_in_series", (((64, 64, 64), 1), ((64, 63, 62), 3))
+)
+def test_atom_box_vs_full_grid_agreement(sample_pdb_path, shape, atom_groups_in_series):
+    voxel_size = 0.5
+
+    # Load the PDB file
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    # Load atomistic potential
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements)
+    # Build the grid
+    voxels = atomic_potential.as_real_voxel_grid(shape, voxel_size)
+    voxels_in_atom_boxes = atomic_potential.as_real_voxel_grid(
+        shape,
+        voxel_size,
+        atom_groups_in_series=atom_groups_in_series,
+        atom_box_size=24,
+    )
+    np.testing.assert_allclose(voxels, voxels_in_atom_boxes, atol=1e-8)
+
+
+@pytest.mark.parametrize(
+    "z_planes_in_parallel,atom_groups_in_series", ((1, 1), (5, 1), (8, 2))
+)
+def test_atoms_per_z_batch_vs_all_atoms_agreement(
+    sample_pdb_path, z_planes_in_parallel, atom_groups_in_series
+):
+    shape = (64, 32, 32)
+    voxel_size = 0.5
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    # ... stack copies of the atoms along z, so that each z-plane only
+    # overlaps with a subset of the atoms
+    atom_positions = np.concatenate(
+        [atom_positions + np.asarray([0.0, 0.0, z]) for z in (-12.0, 0.0, 12.0)]
+    )
+    atom_elements = np.concatenate(3 * [atom_elements])
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements)
+    # Build the grids
+    voxels = atomic_potential.as_real_voxel_grid(shape, voxel_size)
+    voxels_with_z_batches = atomic_potential.as_real_voxel_grid(
+        shape,
+        voxel_size,
+        z_planes_in_parallel=z_planes_in_parallel,
+        atom_groups_in_series=atom_groups_in_series,
+        atoms_per_z_batch=150,
+    )
+    np.testing.assert_allclose(
+        voxels, voxels_with_z_batches, atol=1e-8 * np.abs(voxels).max()
+    )
+
+
+@pytest.mark.parametrize("voxel_size,b_factor", ((0.5, None), (1.0, 30.0)))
+def test_automatic_atom_box_vs_full_grid_agreement(sample_pdb_path, voxel_size, b_factor):
+    shape = (64, 63, 62)
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    b_factors = None if b_factor is None else np.full(atom_positions.shape[0], b_factor)
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements, b_factors)
+    # Build the grids
+    voxels = atomic_potential.as_real_voxel_grid(shape, voxel_size)
+    voxels_in_atom_boxes = atomic_potential.as_real_voxel_grid(
+        shape, voxel_size, atom_box_size="auto"
+    )
+    np.testing.assert_allclose(
+        voxels, voxels_in_atom_boxes, atol=1e-8 * np.abs(voxels).max()
+    )
+
+
+def test_atom_box_vs_full_grid_gradient_agreement(sample_pdb_path):
+    shape = (48, 48, 48)
+    voxel_size = 0.5
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements)
+
+    @jax.grad
+    def compute_gradient(atom_positions, atom_box_size):
+        potential = eqx.tree_at(
+            lambda x: x.atom_positions, atomic_potential, atom_positions
+        )
+        voxels = potential.as_real_voxel_grid(
+            shape, voxel_size, atom_box_size=atom_box_size
+        )
+        return jnp.sum(voxels**2)
+
+    gradient = compute_gradient(atomic_potential.atom_positions, None)
+    gradient_in_atom_boxes = compute_gradient(atomic_potential.atom_positions, 24)
+    np.testing.assert_allclose(
+        gradient, gradient_in_atom_boxes, atol=1e-8 * np.abs(gradient).max()
+    )
+
+
+@pytest.mark.parametrize("atom_box_size", (None, 24))
+def test_atom_groups_in_series_gradient_agreement(sample_pdb_path, atom_box_size):
+    # ... differentiating through the checkpointed groups of atoms should
+    # agree with differentiating through a single group
+    shape = (32, 32, 32)
+    voxel_size = 0.5
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements)
+
+    @jax.grad
+    def compute_gradient(atom_positions, atom_groups_in_series):
+        potential = eqx.tree_at(
+            lambda x: x.atom_positions, atomic_potential, atom_positions
+        )
+        voxels = potential.as_real_voxel_grid(
+            shape,
+            voxel_size,
+            atom_groups_in_series=atom_groups_in_series,
+            atom_box_size=atom_box_size,
+        )
+        return jnp.sum(voxels**2)
+
+    gradient = compute_gradient(atomic_potential.atom_positions, 1)
+    gradient_in_groups = compute_gradient(atomic_potential.atom_positions, 3)
+    np.testing.assert_allclose(
+        gradient, gradient_in_groups, atol=1e-10 * np.abs(gradient).max()
+    )
+
+
+@pytest.mark.parametrize("atom_box_size", (None, 24))
+def test_numba_vs_jax_agreement(sample_pdb_path, atom_box_size):
+    pytest.importorskip("numba")
+    if jax.default_backend() != "cpu":
+        pytest.skip("The numba implementation is only used on the CPU.")
+    shape = (48, 47, 46)
+    voxel_size = 0.5
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements)
+    # Build the grids
+    voxels = atomic_potential.as_real_voxel_grid(
+        shape, voxel_size, atom_box_size=atom_box_size
+    )
+    voxels_with_numba = atomic_potential.as_real_voxel_grid(
+        shape, voxel_size, atom_box_size=atom_box_size, use_numba=True
+    )
+    np.testing.assert_allclose(voxels, voxels_with_numba, atol=1e-8)
+
+
+@pytest.mark.parametrize(
+    "z_planes_in_parallel,atom_box_size", ((1, None), (4, None), (1, 24))
+)
+def test_low_precision_intermediates_agreement(
+    sample_pdb_path, z_planes_in_parallel, atom_box_size
+):
+    shape = (64, 64, 64)
+    voxel_size = 0.5
+
+    # Load the PDB file
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    # Load atomistic potential
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements)
+    # Build the grid
+    voxels = atomic_potential.as_real_voxel_grid(shape, voxel_size)
+    voxels_with_bfloat16 = atomic_potential.as_real_voxel_grid(
+        shape,
+        voxel_size,
+        z_planes_in_parallel=z_planes_in_parallel,
+        atom_box_size=atom_box_size,
+        intermediate_dtype=jnp.bfloat16,
+    )
+    assert voxels_with_bfloat16.dtype == voxels.dtype
+    np.testing.assert_allclose(
+        voxels, voxels_with_bfloat16, atol=1e-2 * np.abs(voxels).max()
+    )
+
+
+@pytest.mark.parametrize("is_gaussian_mixture", (False, True))
+def test_real_vs_fourier_space_voxel_potential_agreement(
+    sample_pdb_path, is_gaussian_mixture
+):
+    """Test that evaluating voxel grids in real and fourier space agree
+    when the gaussians are well-sampled.
+    """
+    shape = (64, 63, 62)
+    voxel_size = 0.5
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    # ... add a B-factor so that the real-space voxel grid does not alias
+    b_factors = np.full(atom_positions.shape[0], 60.0)
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements, b_factors)
+    if is_gaussian_mixture:
+        atomic_potential = GaussianMixtureAtomicPotential(
+            atomic_potential.atom_positions,
+            atomic_potential.scattering_factor_a,
+            atomic_potential.scattering_factor_b + b_factors[:, None],
+        )
+    # Build the grids
+    fourier_voxels_from_real_space = fftn(
+        atomic_potential.as_real_voxel_grid(shape, voxel_size)
+    )
+    fourier_voxels = atomic_potential.as_fourier_voxel_grid(shape, voxel_size)
+
+    np.testing.assert_allclose(
+        fourier_voxels_from_real_space,
+        fourier_voxels,
+        atol=1e-6 * np.abs(fourier_voxels_from_real_space).max(),
+    )
+
+
+@pytest.mark.parametrize("atom_box_size", (None, 24))
+def test_batched_vs_looped_over_poses_agreement(sample_pdb_path, atom_box_size):
+    shape = (64, 64, 64)
+    voxel_size = 0.5
+    atom_positions, atom_elements = read_atoms_from_pdb(sample_pdb_path)
+    atom_positions = atom_positions - np.mean(atom_positions, axis=0)
+    atomic_potential = PengAtomicPotential(atom_positions, atom_elements)
+    # Make a batch of poses
+    view_angles = jnp.asarray([[0.0, 0.0, 0.0], [10.0, 30.0, -20.0], [90.0, 45.0, 5.0]])
+    poses = eqx.filter_vmap(
+        lambda angles: EulerAnglePose(
+            view_phi=angles[0], view_theta=angles[1], view_psi=angles[2]
+        )
+    )(view_angles)
+    # Build the grids
+    batched_voxels = atomic_potential.as_real_voxel_grid_batched(
+        poses, shape, voxel_size, atom_box_size=atom_box_size
+    )
+    assert batched_voxels.shape == (view_angles.shape[0], *shape)
+    for i, angles in enumerate(view_angles):
+        pose = EulerAnglePose(
+            view_phi=angles[0], view_theta=angles[1], view_psi=angles[2]
+        )
+        voxels = atomic_potential.rotate_to_pose(pose).as_real_voxel_grid(
+            shape, voxel_size, atom_box_size=atom_box_size
+        )
+        np.testing.assert_allclose(batched_voxels[i], voxels, atol=1e-10)
+
+
 @pytest.mark.parametrize("shape", ((128, 127, 126),))
 def test_compute_rectangular_voxel_grid(sample_pdb_path, shape):
     voxel_size = 0.5